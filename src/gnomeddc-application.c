@@ -1,33 +1,22 @@
 #include "gnomeddc-application.h"
 
+#include "config.h"
 #include "gnomeddc-window.h"
 
 #include <gio/gio.h>
-
-extern GResource *gnomeddc_get_resource(void);
+#include <glib/gi18n.h>
 
 struct _GnomeDdcApplication {
   AdwApplication parent_instance;
+
+  GnomeDdcClient *client;
 };
 
 G_DEFINE_FINAL_TYPE(GnomeDdcApplication, gnome_ddc_application, ADW_TYPE_APPLICATION)
 
-static void
-ensure_resources_registered(void)
-{
-  static gsize registered = 0;
-
-  if (g_once_init_enter(&registered)) {
-    g_resources_register(gnomeddc_get_resource());
-    g_once_init_leave(&registered, 1);
-  }
-}
-
 static void
 gnome_ddc_application_activate(GApplication *app)
 {
-  ensure_resources_registered();
-
   GList *windows = gtk_application_get_windows(GTK_APPLICATION(app));
   if (windows) {
     gtk_window_present(GTK_WINDOW(windows->data));
@@ -36,21 +25,54 @@ gnome_ddc_application_activate(GApplication *app)
 
   GnomeDdcWindow *window = g_object_new(GNOMEDDC_TYPE_WINDOW,
                                         "application", app,
+                                        "client", gnome_ddc_application_get_client(GNOMEDDC_APPLICATION(app)),
                                         NULL);
   gtk_window_present(GTK_WINDOW(window));
 }
 
+static gint
+gnome_ddc_application_handle_local_options(GApplication *app,
+                                           GVariantDict *options)
+{
+  (void)app;
+
+  if (g_variant_dict_contains(options, "version")) {
+    g_print("gnomeddc %s\n", PACKAGE_VERSION);
+    return 0;
+  }
+
+  return -1;
+}
+
+static void
+gnome_ddc_application_dispose(GObject *object)
+{
+  GnomeDdcApplication *self = GNOMEDDC_APPLICATION(object);
+  g_clear_object(&self->client);
+  G_OBJECT_CLASS(gnome_ddc_application_parent_class)->dispose(object);
+}
+
 static void
 gnome_ddc_application_class_init(GnomeDdcApplicationClass *klass)
 {
+  GObjectClass *object_class = G_OBJECT_CLASS(klass);
   GApplicationClass *app_class = G_APPLICATION_CLASS(klass);
+  object_class->dispose = gnome_ddc_application_dispose;
   app_class->activate = gnome_ddc_application_activate;
+  app_class->handle_local_options = gnome_ddc_application_handle_local_options;
 }
 
 static void
 gnome_ddc_application_init(GnomeDdcApplication *self)
 {
   g_application_set_resource_base_path(G_APPLICATION(self), "/com/ddcutil/GnomeDDC");
+  g_application_add_main_option(G_APPLICATION(self),
+                                "version",
+                                'v',
+                                G_OPTION_FLAG_NONE,
+                                G_OPTION_ARG_NONE,
+                                _("Print the version and exit"),
+                                NULL);
 }
 
 GnomeDdcApplication *
@@ -61,3 +83,15 @@ gnome_ddc_application_new(void)
                       "flags", G_APPLICATION_HANDLES_OPEN,
                       NULL);
 }
+
+GnomeDdcClient *
+gnome_ddc_application_get_client(GnomeDdcApplication *self)
+{
+  g_return_val_if_fail(GNOMEDDC_IS_APPLICATION(self), NULL);
+
+  if (self->client == NULL) {
+    self->client = gnomeddc_client_new();
+  }
+
+  return self->client;
+}
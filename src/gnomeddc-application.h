@@ -3,6 +3,8 @@
 
 #include <adwaita.h>
 
+#include "gnomeddc-client.h"
+
 G_BEGIN_DECLS
 
 #define GNOMEDDC_TYPE_APPLICATION (gnome_ddc_application_get_type())
@@ -10,6 +12,7 @@ G_BEGIN_DECLS
 G_DECLARE_FINAL_TYPE(GnomeDdcApplication, gnome_ddc_application, GNOMEDDC, APPLICATION, AdwApplication)
 
 GnomeDdcApplication *gnome_ddc_application_new(void);
+GnomeDdcClient *gnome_ddc_application_get_client(GnomeDdcApplication *self);
 
 G_END_DECLS
 
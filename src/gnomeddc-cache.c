@@ -0,0 +1,120 @@
+#include "gnomeddc-cache.h"
+
+typedef struct {
+  GFile *file;
+  GBytes *bytes;
+  GSList *missing_dirs;
+  gboolean retried;
+} CacheWrite;
+
+static void
+cache_write_free(CacheWrite *write)
+{
+  g_object_unref(write->file);
+  g_bytes_unref(write->bytes);
+  g_slist_free_full(write->missing_dirs, g_object_unref);
+  g_free(write);
+}
+
+static void cache_file_replaced_cb(GObject *source, GAsyncResult *result, gpointer user_data);
+static void cache_dir_made_cb(GObject *source, GAsyncResult *result, gpointer user_data);
+
+static void
+replace_cache_file(CacheWrite *write)
+{
+  g_file_replace_contents_bytes_async(write->file,
+                                      write->bytes,
+                                      NULL,
+                                      FALSE,
+                                      G_FILE_CREATE_PRIVATE | G_FILE_CREATE_REPLACE_DESTINATION,
+                                      NULL,
+                                      cache_file_replaced_cb,
+                                      write);
+}
+
+static void
+make_next_cache_dir(CacheWrite *write)
+{
+  g_file_make_directory_async(write->missing_dirs->data, G_PRIORITY_DEFAULT, NULL, cache_dir_made_cb, write);
+}
+
+static void
+cache_dir_made_cb(GObject *source, GAsyncResult *result, gpointer user_data)
+{
+  CacheWrite *write = user_data;
+  g_autoptr(GError) error = NULL;
+
+  if (!g_file_make_directory_finish(G_FILE(source), result, &error)) {
+    GFile *parent = g_error_matches(error, G_IO_ERROR, G_IO_ERROR_NOT_FOUND) ? g_file_get_parent(G_FILE(source)) : NULL;
+    if (parent != NULL) {
+      write->missing_dirs = g_slist_prepend(write->missing_dirs, parent);
+      make_next_cache_dir(write);
+      return;
+    }
+
+    if (!g_error_matches(error, G_IO_ERROR, G_IO_ERROR_EXISTS)) {
+      g_debug("Unable to create cache directory: %s", error->message);
+      cache_write_free(write);
+      return;
+    }
+  }
+
+  g_object_unref(write->missing_dirs->data);
+  write->missing_dirs = g_slist_delete_link(write->missing_dirs, write->missing_dirs);
+  if (write->missing_dirs != NULL) {
+    make_next_cache_dir(write);
+  } else {
+    replace_cache_file(write);
+  }
+}
+
+static void
+cache_file_replaced_cb(GObject *source, GAsyncResult *result, gpointer user_data)
+{
+  CacheWrite *write = user_data;
+  g_autoptr(GError) error = NULL;
+
+  if (!g_file_replace_contents_finish(G_FILE(source), result, NULL, &error)) {
+    if (g_error_matches(error, G_IO_ERROR, G_IO_ERROR_NOT_FOUND) && !write->retried) {
+      write->retried = TRUE;
+      write->missing_dirs = g_slist_prepend(NULL, g_file_get_parent(write->file));
+      make_next_cache_dir(write);
+      return;
+    }
+
+    g_debug("Unable to write cache file: %s", error->message);
+  }
+
+  cache_write_free(write);
+}
+
+void
+gnomeddc_cache_write_async(GFile *file, GBytes *bytes)
+{
+  g_return_if_fail(G_IS_FILE(file));
+  g_return_if_fail(bytes != NULL);
+
+  CacheWrite *write = g_new0(CacheWrite, 1);
+  write->file = g_object_ref(file);
+  write->bytes = g_bytes_ref(bytes);
+  replace_cache_file(write);
+}
+
+static void
+cache_file_deleted_cb(GObject *source, GAsyncResult *result, gpointer user_data G_GNUC_UNUSED)
+{
+  g_autoptr(GError) error = NULL;
+
+  if (!g_file_delete_finish(G_FILE(source), result, &error) &&
+      !g_error_matches(error, G_IO_ERROR, G_IO_ERROR_NOT_FOUND)) {
+    g_debug("Unable to remove cache file: %s", error->message);
+  }
+}
+
+void
+gnomeddc_cache_delete_async(GFile *file)
+{
+  g_return_if_fail(G_IS_FILE(file));
+
+  g_file_delete_async(file, G_PRIORITY_DEFAULT, NULL, cache_file_deleted_cb, NULL);
+}
@@ -0,0 +1,13 @@
+#ifndef GNOMEDDC_CACHE_H
+#define GNOMEDDC_CACHE_H
+
+#include <gio/gio.h>
+
+G_BEGIN_DECLS
+
+void gnomeddc_cache_write_async(GFile *file, GBytes *bytes);
+void gnomeddc_cache_delete_async(GFile *file);
+
+G_END_DECLS
+
+#endif /* GNOMEDDC_CACHE_H */
@@ -1,8 +1,64 @@
 #include "gnomeddc-client.h"
+#include "gnomeddc-cache.h"
+#include "gnomeddc-marshal.h"
 
-#define DDCUTIL_SERVICE_NAME "com.ddcutil.DdcutilService"
-#define DDCUTIL_OBJECT_PATH "/com/ddcutil/DdcutilObject"
-#define DDCUTIL_INTERFACE_NAME "com.ddcutil.DdcutilInterface"
+#include <string.h>
+
+#define RESPONSE_CACHE_TTL (500 * G_TIME_SPAN_MILLISECOND)
+#define MAX_CALLS_IN_FLIGHT 2
+
+typedef enum {
+  METHOD_FLAG_CACHEABLE = 1 << 0,
+  METHOD_FLAG_GET_VCP = 1 << 1,
+  METHOD_FLAG_VCP_WRITE = 1 << 2,
+  METHOD_FLAG_PROPERTY_WRITE = 1 << 3,
+  METHOD_FLAG_CAPABILITIES = 1 << 4,
+  METHOD_FLAG_COALESCE = 1 << 5
+} MethodFlags;
+
+static const struct {
+  const gchar *name;
+  MethodFlags flags;
+  const gchar *reply_type;
+} method_flags_table[] = {
+  { "Detect", METHOD_FLAG_COALESCE, NULL },
+  { "ListDetected", METHOD_FLAG_COALESCE, NULL },
+  { "GetVcp", METHOD_FLAG_CACHEABLE | METHOD_FLAG_GET_VCP, NULL },
+  { "GetMultipleVcp", METHOD_FLAG_CACHEABLE, NULL },
+  { "GetCapabilitiesString", METHOD_FLAG_CAPABILITIES, "(sis)" },
+  { "GetCapabilitiesMetadata", METHOD_FLAG_CAPABILITIES, "(syya{ys}a{y(ssa{ys})}is)" },
+  { "SetVcp", METHOD_FLAG_VCP_WRITE, NULL },
+  { "SetVcpWithContext", METHOD_FLAG_VCP_WRITE, NULL },
+  { "org.freedesktop.DBus.Properties.Set", METHOD_FLAG_PROPERTY_WRITE, NULL },
+};
+
+typedef struct {
+  GQueue queue;
+  gboolean in_flight;
+  gboolean ready;
+  guint generation;
+} CallLane;
+
+typedef struct {
+  GVariant *response;
+  gint64 expires_at;
+  CallLane *lane;
+  guint generation;
+} CachedResponse;
+
+typedef struct {
+  gchar *method;
+  GVariant *parameters;
+  GBytes *cache_key;
+  gchar *write_key;
+  GPtrArray *followers;
+  CallLane *lane;
+  guint generation;
+  MethodFlags flags;
+  const gchar *reply_type;
+  guint capabilities_generation;
+  gboolean unbatched;
+} PendingCall;
 
 struct _GnomeDdcClient {
   GObject parent_instance;
@@ -10,10 +66,51 @@ struct _GnomeDdcClient {
   GDBusProxy *proxy;
   GnomeDdcClientBusType bus_type;
   gchar *last_error;
+  GHashTable *response_cache;
+  GHashTable *capabilities_cache;
+  GHashTable *call_lanes;
+  GHashTable *pending_reads;
+  GQueue ready_lanes;
+  guint capabilities_generation;
+  guint calls_in_flight;
+  gboolean connecting;
 };
 
 G_DEFINE_FINAL_TYPE(GnomeDdcClient, gnomeddc_client, G_TYPE_OBJECT)
 
+enum {
+  SIGNAL_VCP_VALUE_CHANGED,
+  SIGNAL_CONNECTED_DISPLAYS_CHANGED,
+  N_SIGNALS
+};
+
+static guint signals[N_SIGNALS];
+
+static void
+cached_response_free(CachedResponse *cached)
+{
+  g_variant_unref(cached->response);
+  g_free(cached);
+}
+
+static void
+pending_call_free(PendingCall *call)
+{
+  g_free(call->method);
+  g_variant_unref(call->parameters);
+  g_clear_pointer(&call->cache_key, g_bytes_unref);
+  g_free(call->write_key);
+  g_clear_pointer(&call->followers, g_ptr_array_unref);
+  g_free(call);
+}
+
+static void
+call_lane_free(CallLane *lane)
+{
+  g_queue_clear(&lane->queue);
+  g_free(lane);
+}
+
 static void
 set_last_error(GnomeDdcClient *self, const gchar *message)
 {
@@ -23,48 +120,233 @@ set_last_error(GnomeDdcClient *self, const gchar *message)
   }
 }
 
+static void dispatch_next_call(GnomeDdcClient *self, CallLane *lane);
+
 static void
-gnomeddc_client_constructed(GObject *object)
+mark_lane_ready(GnomeDdcClient *self, CallLane *lane)
 {
-  G_OBJECT_CLASS(gnomeddc_client_parent_class)->constructed(object);
+  if (!lane->ready && !lane->in_flight && lane->queue.head != NULL) {
+    lane->ready = TRUE;
+    g_queue_push_tail(&self->ready_lanes, lane);
+  }
+}
 
-  GnomeDdcClient *self = GNOMEDDC_CLIENT(object);
+static void
+dispatch_ready_lanes(GnomeDdcClient *self)
+{
+  CallLane *lane;
+
+  while (self->proxy != NULL && self->calls_in_flight < MAX_CALLS_IN_FLIGHT &&
+         (lane = g_queue_pop_head(&self->ready_lanes)) != NULL) {
+    lane->ready = FALSE;
+    dispatch_next_call(self, lane);
+  }
+}
+
+static void
+add_follower(PendingCall *call, GTask *follower)
+{
+  if (call->followers == NULL) {
+    call->followers = g_ptr_array_new_with_free_func(g_object_unref);
+  }
+  g_ptr_array_add(call->followers, follower);
+}
+
+static void
+return_followers(GnomeDdcClient *self, GTask *task, GVariant *response, const GError *error)
+{
+  PendingCall *call = g_task_get_task_data(task);
+
+  if (call->cache_key != NULL && g_hash_table_lookup(self->pending_reads, call->cache_key) == task) {
+    g_hash_table_remove(self->pending_reads, call->cache_key);
+  }
+
+  for (guint i = 0; call->followers != NULL && i < call->followers->len; i++) {
+    GTask *follower = g_ptr_array_index(call->followers, i);
+    if (response == NULL) {
+      g_task_return_error(follower, g_error_copy(error));
+    } else {
+      g_task_return_pointer(follower, g_variant_ref(response), (GDestroyNotify) g_variant_unref);
+    }
+  }
+}
+
+static void
+fail_pending_calls(GnomeDdcClient *self)
+{
+  GHashTableIter iter;
+  gpointer value;
+
+  g_hash_table_iter_init(&iter, self->call_lanes);
+  while (g_hash_table_iter_next(&iter, NULL, &value)) {
+    CallLane *lane = value;
+    GTask *task;
+    lane->ready = FALSE;
+    while ((task = g_queue_pop_head(&lane->queue)) != NULL) {
+      GError *error = g_error_new(G_IO_ERROR, G_IO_ERROR_FAILED, "%s", self->last_error ? self->last_error : "Proxy unavailable");
+      return_followers(self, task, NULL, error);
+      g_task_return_error(task, error);
+      g_object_unref(task);
+    }
+  }
+  g_queue_clear(&self->ready_lanes);
+}
+
+static void
+bump_lane_generation(GnomeDdcClient *self, const gchar *edid)
+{
+  CallLane *lane = g_hash_table_lookup(self->call_lanes, edid);
+  if (lane != NULL) {
+    lane->generation++;
+  }
+}
+
+static void
+handle_vcp_value_changed(GnomeDdcClient *self, GVariant *parameters)
+{
+  gint display_number;
+  const gchar *edid;
+  guint8 code;
+  guint16 value;
+  const gchar *source_client;
+  const gchar *source_context;
+  guint32 flags;
+  g_variant_get(parameters, "(i&syq&s&su)",
+                &display_number,
+                &edid,
+                &code,
+                &value,
+                &source_client,
+                &source_context,
+                &flags);
+
+  bump_lane_generation(self, edid);
+  if (g_signal_has_handler_pending(self, signals[SIGNAL_VCP_VALUE_CHANGED], 0, FALSE)) {
+    g_signal_emit(self, signals[SIGNAL_VCP_VALUE_CHANGED], 0,
+                  display_number,
+                  edid,
+                  code,
+                  (guint) value,
+                  source_client,
+                  source_context,
+                  flags);
+  }
+}
+
+static void
+handle_connected_displays_changed(GnomeDdcClient *self, GVariant *parameters)
+{
+  const gchar *edid;
+  gint event_type;
+  guint32 flags;
+  g_variant_get(parameters, "(&siu)", &edid, &event_type, &flags);
+
+  bump_lane_generation(self, edid);
+  bump_lane_generation(self, "");
+  if (g_signal_has_handler_pending(self, signals[SIGNAL_CONNECTED_DISPLAYS_CHANGED], 0, FALSE)) {
+    g_signal_emit(self, signals[SIGNAL_CONNECTED_DISPLAYS_CHANGED], 0, edid, event_type, flags);
+  }
+}
+
+static void
+handle_service_initialized(GnomeDdcClient *self, GVariant *parameters G_GNUC_UNUSED)
+{
+  g_hash_table_remove_all(self->response_cache);
+  g_hash_table_remove_all(self->capabilities_cache);
+  self->capabilities_generation++;
+}
+
+typedef struct {
+  const gchar *name;
+  const gchar *signature;
+  void (*handler)(GnomeDdcClient *self, GVariant *parameters);
+} ServiceSignal;
+
+static const ServiceSignal service_signals[] = {
+  { "VcpValueChanged", "(isyqssu)", handle_vcp_value_changed },
+  { "ConnectedDisplaysChanged", "(siu)", handle_connected_displays_changed },
+  { "ServiceInitialized", "(u)", handle_service_initialized },
+};
+
+static GHashTable *service_signal_index;
+
+static void
+proxy_signal_cb(GDBusProxy *proxy G_GNUC_UNUSED,
+                const gchar *sender_name G_GNUC_UNUSED,
+                const gchar *signal_name,
+                GVariant *parameters,
+                gpointer user_data)
+{
+  const ServiceSignal *entry = g_hash_table_lookup(service_signal_index, signal_name);
+  if (entry == NULL || !g_variant_is_of_type(parameters, G_VARIANT_TYPE(entry->signature))) {
+    return;
+  }
+
+  entry->handler(GNOMEDDC_CLIENT(user_data), parameters);
+}
+
+static void
+proxy_ready_cb(GObject *source G_GNUC_UNUSED, GAsyncResult *result, gpointer user_data)
+{
+  g_autoptr(GnomeDdcClient) self = user_data;
   g_autoptr(GError) error = NULL;
-  GDBusConnection *connection = g_bus_get_sync(G_BUS_TYPE_SYSTEM, NULL, &error);
 
-  if (connection == NULL) {
+  self->proxy = g_dbus_proxy_new_finish(result, &error);
+  self->connecting = FALSE;
+
+  if (self->proxy == NULL) {
+    set_last_error(self, error != NULL ? error->message : "Unable to create D-Bus proxy");
+    g_warning("Unable to create proxy for %s: %s", DDCUTIL_SERVICE_NAME, self->last_error ? self->last_error : "");
+    fail_pending_calls(self);
+    return;
+  }
+
+  set_last_error(self, NULL);
+  g_signal_connect_object(self->proxy, "g-signal", G_CALLBACK(proxy_signal_cb), self, 0);
+  dispatch_ready_lanes(self);
+}
+
+static void
+bus_ready_cb(GObject *source G_GNUC_UNUSED, GAsyncResult *result, gpointer user_data)
+{
+  g_autoptr(GnomeDdcClient) self = user_data;
+  g_autoptr(GError) error = NULL;
+  g_autoptr(GDBusConnection) connection = g_bus_get_finish(result, &error);
+
+  if (connection == NULL && self->bus_type == GNOMEDDC_CLIENT_BUS_SYSTEM) {
     set_last_error(self, error != NULL ? error->message : "");
-    g_clear_error(&error);
-    connection = g_bus_get_sync(G_BUS_TYPE_SESSION, NULL, &error);
     self->bus_type = GNOMEDDC_CLIENT_BUS_SESSION;
-  } else {
-    self->bus_type = GNOMEDDC_CLIENT_BUS_SYSTEM;
+    g_bus_get(G_BUS_TYPE_SESSION, NULL, bus_ready_cb, g_steal_pointer(&self));
+    return;
   }
 
   if (connection == NULL) {
     set_last_error(self, error != NULL ? error->message : "Failed to connect to D-Bus");
     g_warning("Unable to connect to D-Bus: %s", self->last_error ? self->last_error : "unknown error");
+    self->connecting = FALSE;
+    fail_pending_calls(self);
     return;
   }
 
-  g_autoptr(GError) proxy_error = NULL;
-  self->proxy = g_dbus_proxy_new_sync(connection,
-                                      G_DBUS_PROXY_FLAGS_NONE,
-                                      NULL,
-                                      DDCUTIL_SERVICE_NAME,
-                                      DDCUTIL_OBJECT_PATH,
-                                      DDCUTIL_INTERFACE_NAME,
-                                      NULL,
-                                      &proxy_error);
-  g_object_unref(connection);
+  g_dbus_proxy_new(connection,
+                   G_DBUS_PROXY_FLAGS_DO_NOT_LOAD_PROPERTIES,
+                   NULL,
+                   DDCUTIL_SERVICE_NAME,
+                   DDCUTIL_OBJECT_PATH,
+                   DDCUTIL_INTERFACE_NAME,
+                   NULL,
+                   proxy_ready_cb,
+                   g_steal_pointer(&self));
+}
 
-  if (self->proxy == NULL) {
-    set_last_error(self, proxy_error != NULL ? proxy_error->message : "Unable to create D-Bus proxy");
-    g_warning("Unable to create proxy for %s: %s", DDCUTIL_SERVICE_NAME, self->last_error ? self->last_error : "");
-    return;
-  }
+static void
+gnomeddc_client_constructed(GObject *object)
+{
+  G_OBJECT_CLASS(gnomeddc_client_parent_class)->constructed(object);
 
-  set_last_error(self, NULL);
+  GnomeDdcClient *self = GNOMEDDC_CLIENT(object);
+  self->connecting = TRUE;
+  g_bus_get(G_BUS_TYPE_SYSTEM, NULL, bus_ready_cb, g_object_ref(self));
 }
 
 static void
@@ -73,6 +355,11 @@ gnomeddc_client_finalize(GObject *object)
   GnomeDdcClient *self = GNOMEDDC_CLIENT(object);
   g_clear_object(&self->proxy);
   g_clear_pointer(&self->last_error, g_free);
+  g_clear_pointer(&self->response_cache, g_hash_table_unref);
+  g_clear_pointer(&self->capabilities_cache, g_hash_table_unref);
+  g_queue_clear(&self->ready_lanes);
+  g_clear_pointer(&self->call_lanes, g_hash_table_unref);
+  g_clear_pointer(&self->pending_reads, g_hash_table_unref);
   G_OBJECT_CLASS(gnomeddc_client_parent_class)->finalize(object);
 }
 
@@ -82,12 +369,71 @@ gnomeddc_client_class_init(GnomeDdcClientClass *klass)
   GObjectClass *object_class = G_OBJECT_CLASS(klass);
   object_class->constructed = gnomeddc_client_constructed;
   object_class->finalize = gnomeddc_client_finalize;
+
+  signals[SIGNAL_VCP_VALUE_CHANGED] =
+    g_signal_new("vcp-value-changed",
+                 G_TYPE_FROM_CLASS(klass),
+                 G_SIGNAL_RUN_LAST,
+                 0,
+                 NULL,
+                 NULL,
+                 gnomeddc_marshal_VOID__INT_STRING_UCHAR_UINT_STRING_STRING_UINT,
+                 G_TYPE_NONE,
+                 7,
+                 G_TYPE_INT,
+                 G_TYPE_STRING,
+                 G_TYPE_UCHAR,
+                 G_TYPE_UINT,
+                 G_TYPE_STRING,
+                 G_TYPE_STRING,
+                 G_TYPE_UINT);
+  g_signal_set_va_marshaller(signals[SIGNAL_VCP_VALUE_CHANGED],
+                             G_TYPE_FROM_CLASS(klass),
+                             gnomeddc_marshal_VOID__INT_STRING_UCHAR_UINT_STRING_STRING_UINTv);
+
+  signals[SIGNAL_CONNECTED_DISPLAYS_CHANGED] =
+    g_signal_new("connected-displays-changed",
+                 G_TYPE_FROM_CLASS(klass),
+                 G_SIGNAL_RUN_LAST,
+                 0,
+                 NULL,
+                 NULL,
+                 gnomeddc_marshal_VOID__STRING_INT_UINT,
+                 G_TYPE_NONE,
+                 3,
+                 G_TYPE_STRING,
+                 G_TYPE_INT,
+                 G_TYPE_UINT);
+  g_signal_set_va_marshaller(signals[SIGNAL_CONNECTED_DISPLAYS_CHANGED],
+                             G_TYPE_FROM_CLASS(klass),
+                             gnomeddc_marshal_VOID__STRING_INT_UINTv);
+
+  service_signal_index = g_hash_table_new(g_str_hash, g_str_equal);
+  for (guint i = 0; i < G_N_ELEMENTS(service_signals); i++) {
+    g_hash_table_insert(service_signal_index,
+                        (gpointer) service_signals[i].name,
+                        (gpointer) &service_signals[i]);
+  }
 }
 
 static void
 gnomeddc_client_init(GnomeDdcClient *self)
 {
   self->bus_type = GNOMEDDC_CLIENT_BUS_SYSTEM;
+  self->response_cache = g_hash_table_new_full(g_bytes_hash,
+                                               g_bytes_equal,
+                                               (GDestroyNotify) g_bytes_unref,
+                                               (GDestroyNotify) cached_response_free);
+  self->capabilities_cache = g_hash_table_new_full(g_bytes_hash,
+                                                   g_bytes_equal,
+                                                   (GDestroyNotify) g_bytes_unref,
+                                                   (GDestroyNotify) g_variant_unref);
+  self->call_lanes = g_hash_table_new_full(g_str_hash,
+                                           g_str_equal,
+                                           g_free,
+                                           (GDestroyNotify) call_lane_free);
+  self->pending_reads = g_hash_table_new(g_bytes_hash, g_bytes_equal);
+  g_queue_init(&self->ready_lanes);
 }
 
 GnomeDdcClient *
@@ -107,7 +453,7 @@ gboolean
 gnomeddc_client_is_connected(GnomeDdcClient *self)
 {
   g_return_val_if_fail(GNOMEDDC_IS_CLIENT(self), FALSE);
-  return self->proxy != NULL;
+  return self->proxy != NULL || self->connecting;
 }
 
 GnomeDdcClientBusType
@@ -134,6 +480,473 @@ ensure_parameters(GVariant *parameters)
   return g_variant_ref_sink(g_variant_new_tuple(NULL, 0));
 }
 
+static MethodFlags
+lookup_method_flags(const gchar *method, const gchar **reply_type)
+{
+  for (guint i = 0; i < G_N_ELEMENTS(method_flags_table); i++) {
+    if (g_str_equal(method, method_flags_table[i].name)) {
+      *reply_type = method_flags_table[i].reply_type;
+      return method_flags_table[i].flags;
+    }
+  }
+
+  *reply_type = NULL;
+  return 0;
+}
+
+static GBytes *
+build_cache_key(const gchar *method, gconstpointer data, gsize size)
+{
+  gsize method_size = strlen(method) + 1;
+  guint8 *key = g_malloc(method_size + size);
+  memcpy(key, method, method_size);
+  memcpy(key + method_size, data, size);
+  return g_bytes_new_take(key, method_size + size);
+}
+
+static GVariant *
+lookup_cached_response(GnomeDdcClient *self, GBytes *key)
+{
+  CachedResponse *cached = g_hash_table_lookup(self->response_cache, key);
+  if (cached == NULL) {
+    return NULL;
+  }
+
+  if (g_get_monotonic_time() >= cached->expires_at || cached->generation != cached->lane->generation) {
+    g_hash_table_remove(self->response_cache, key);
+    return NULL;
+  }
+
+  return g_variant_ref(cached->response);
+}
+
+static void
+store_cached_response(GnomeDdcClient *self, PendingCall *call, GVariant *response)
+{
+  if (call->generation != call->lane->generation) {
+    return;
+  }
+
+  CachedResponse *cached = g_new0(CachedResponse, 1);
+  cached->response = g_variant_ref(response);
+  cached->expires_at = g_get_monotonic_time() + RESPONSE_CACHE_TTL;
+  cached->lane = call->lane;
+  cached->generation = call->generation;
+  g_hash_table_replace(self->response_cache, g_bytes_ref(call->cache_key), cached);
+}
+
+static GFile *
+get_capabilities_cache_file(const gchar *method, const gchar *edid)
+{
+  g_autofree gchar *digest = g_compute_checksum_for_string(G_CHECKSUM_SHA256, edid, -1);
+  g_autofree gchar *filename = g_strdup_printf("%s-%s.gvariant", method, digest);
+  g_autofree gchar *path = g_build_filename(g_get_user_cache_dir(), "gnomeddc", "capabilities", filename, NULL);
+  return g_file_new_for_path(path);
+}
+
+static GVariant *
+decode_capabilities(GBytes *bytes, const gchar *reply_type)
+{
+  g_autoptr(GVariant) boxed = g_variant_ref_sink(g_variant_new_from_bytes(G_VARIANT_TYPE_VARIANT, bytes, FALSE));
+  g_autoptr(GVariant) response = g_variant_get_variant(boxed);
+  if (!g_variant_is_of_type(response, G_VARIANT_TYPE(reply_type))) {
+    return NULL;
+  }
+
+  return g_steal_pointer(&response);
+}
+
+static void
+save_capabilities(const gchar *method, const gchar *edid, GVariant *response)
+{
+  g_autoptr(GFile) file = get_capabilities_cache_file(method, edid);
+  g_autoptr(GVariant) boxed = g_variant_ref_sink(g_variant_new_variant(response));
+  g_autoptr(GBytes) bytes = g_variant_get_data_as_bytes(boxed);
+
+  gnomeddc_cache_write_async(file, bytes);
+}
+
+static gboolean
+response_status_ok(GVariant *response)
+{
+  gsize n_children = g_variant_n_children(response);
+  if (n_children < 2) {
+    return FALSE;
+  }
+
+  g_autoptr(GVariant) status = g_variant_get_child_value(response, n_children - 2);
+  return g_variant_is_of_type(status, G_VARIANT_TYPE_INT32) && g_variant_get_int32(status) == 0;
+}
+
+static const gchar *
+lane_key_for_parameters(GVariant *parameters)
+{
+  const gchar *edid = "";
+
+  if (g_str_has_prefix(g_variant_get_type_string(parameters), "(is")) {
+    g_variant_get_child(parameters, 1, "&s", &edid);
+  }
+
+  return edid;
+}
+
+static gchar *
+build_write_key(PendingCall *call)
+{
+  if (call->flags & METHOD_FLAG_VCP_WRITE) {
+    guint8 code = 0;
+    g_variant_get_child(call->parameters, 2, "y", &code);
+    return g_strdup_printf("%s:%u", call->method, code);
+  }
+
+  if (call->flags & METHOD_FLAG_PROPERTY_WRITE) {
+    const gchar *property_name = NULL;
+    g_variant_get_child(call->parameters, 1, "&s", &property_name);
+    return g_strconcat(call->method, ":", property_name, NULL);
+  }
+
+  return NULL;
+}
+
+static gboolean
+supersede_queued_write(CallLane *lane, GTask *task)
+{
+  PendingCall *call = g_task_get_task_data(task);
+
+  for (GList *link = lane->queue.head; link != NULL; link = link->next) {
+    PendingCall *queued = g_task_get_task_data(link->data);
+    if (g_strcmp0(queued->write_key, call->write_key) != 0) {
+      continue;
+    }
+
+    g_variant_unref(queued->parameters);
+    queued->parameters = g_variant_ref(call->parameters);
+    add_follower(queued, task);
+    return TRUE;
+  }
+
+  return FALSE;
+}
+
+static gboolean
+join_pending_read(GnomeDdcClient *self, GTask *task)
+{
+  PendingCall *call = g_task_get_task_data(task);
+  if (g_task_get_cancellable(task) != NULL) {
+    return FALSE;
+  }
+
+  GTask *leader = g_hash_table_lookup(self->pending_reads, call->cache_key);
+  if (leader != NULL) {
+    PendingCall *leading = g_task_get_task_data(leader);
+    if (leading->generation == call->generation) {
+      add_follower(leading, task);
+      return TRUE;
+    }
+  }
+
+  g_hash_table_replace(self->pending_reads, call->cache_key, task);
+  return FALSE;
+}
+
+static CallLane *
+lookup_call_lane(GnomeDdcClient *self, const gchar *key)
+{
+  CallLane *lane = g_hash_table_lookup(self->call_lanes, key);
+  if (lane == NULL) {
+    lane = g_new0(CallLane, 1);
+    g_queue_init(&lane->queue);
+    g_hash_table_insert(self->call_lanes, g_strdup(key), lane);
+  }
+
+  return lane;
+}
+
+static void
+enqueue_call(CallLane *lane, GTask *task)
+{
+  PendingCall *call = g_task_get_task_data(task);
+  GList *link = NULL;
+
+  if (call->flags & METHOD_FLAG_VCP_WRITE) {
+    for (link = lane->queue.head; link != NULL; link = link->next) {
+      PendingCall *queued = g_task_get_task_data(link->data);
+      if (!(queued->flags & METHOD_FLAG_VCP_WRITE)) {
+        break;
+      }
+    }
+  }
+
+  if (link != NULL) {
+    g_queue_insert_before(&lane->queue, link, task);
+  } else {
+    g_queue_push_tail(&lane->queue, task);
+  }
+}
+
+static void
+begin_lane_call(GnomeDdcClient *self, CallLane *lane)
+{
+  lane->in_flight = TRUE;
+  self->calls_in_flight++;
+}
+
+static void
+finish_lane_call(GnomeDdcClient *self, CallLane *lane)
+{
+  lane->in_flight = FALSE;
+  self->calls_in_flight--;
+  mark_lane_ready(self, lane);
+  dispatch_ready_lanes(self);
+}
+
+static void
+return_response(GnomeDdcClient *self, GTask *task, GVariant *response)
+{
+  PendingCall *call = g_task_get_task_data(task);
+  if (call->flags & METHOD_FLAG_CAPABILITIES) {
+    if (call->cache_key != NULL && response_status_ok(response)) {
+      g_hash_table_replace(self->capabilities_cache, g_bytes_ref(call->cache_key), g_variant_ref(response));
+      save_capabilities(call->method, lane_key_for_parameters(call->parameters), response);
+    }
+  } else if (call->flags & METHOD_FLAG_CACHEABLE) {
+    store_cached_response(self, call, response);
+  }
+
+  g_task_return_pointer(task, response, (GDestroyNotify) g_variant_unref);
+}
+
+static void
+call_ready_cb(GObject *source, GAsyncResult *result, gpointer user_data)
+{
+  g_autoptr(GTask) task = user_data;
+  GnomeDdcClient *self = g_task_get_source_object(task);
+  PendingCall *call = g_task_get_task_data(task);
+  GError *error = NULL;
+  GVariant *response = g_dbus_proxy_call_finish(G_DBUS_PROXY(source), result, &error);
+
+  finish_lane_call(self, call->lane);
+  return_followers(self, task, response, error);
+
+  if (response == NULL) {
+    g_task_return_error(task, error);
+    return;
+  }
+
+  return_response(self, task, response);
+}
+
+static gboolean
+can_batch_get_vcp(GTask *first_task, GTask *other_task)
+{
+  PendingCall *first = g_task_get_task_data(first_task);
+  PendingCall *other = g_task_get_task_data(other_task);
+  if (!(other->flags & METHOD_FLAG_GET_VCP) || other->unbatched || g_task_get_cancellable(other_task) != NULL) {
+    return FALSE;
+  }
+
+  gint first_display, other_display;
+  guint32 first_flags, other_flags;
+  g_variant_get(first->parameters, "(i&syu)", &first_display, NULL, NULL, &first_flags);
+  g_variant_get(other->parameters, "(i&syu)", &other_display, NULL, NULL, &other_flags);
+  return first_display == other_display && first_flags == other_flags;
+}
+
+static void
+index_batched_values(GVariant *values, gint16 index[G_MAXUINT8 + 1])
+{
+  gsize n_values = MIN(g_variant_n_children(values), G_MAXINT16);
+
+  memset(index, -1, (G_MAXUINT8 + 1) * sizeof index[0]);
+  for (gsize i = 0; i < n_values; i++) {
+    guint8 code;
+    g_variant_get_child(values, i, "(yqq&s)", &code, NULL, NULL, NULL);
+    if (index[code] < 0) {
+      index[code] = (gint16) i;
+    }
+  }
+}
+
+static GVariant *
+build_batched_value(GVariant *values, gsize position, gint status, const gchar *message)
+{
+  guint16 current;
+  guint16 max_value;
+  const gchar *formatted;
+
+  g_variant_get_child(values, position, "(yqq&s)", NULL, &current, &max_value, &formatted);
+  return g_variant_ref_sink(g_variant_new("(qqsis)", current, max_value, formatted, status, message));
+}
+
+static void
+batch_ready_cb(GObject *source, GAsyncResult *result, gpointer user_data)
+{
+  g_autoptr(GPtrArray) tasks = user_data;
+  GTask *first = g_ptr_array_index(tasks, 0);
+  GnomeDdcClient *self = g_task_get_source_object(first);
+  CallLane *lane = ((PendingCall *) g_task_get_task_data(first))->lane;
+  g_autoptr(GError) error = NULL;
+  g_autoptr(GVariant) response = g_dbus_proxy_call_finish(G_DBUS_PROXY(source), result, &error);
+
+  g_autoptr(GVariant) values = NULL;
+  gint status = -1;
+  const gchar *message = "";
+  gint16 value_index[G_MAXUINT8 + 1];
+  if (response != NULL) {
+    g_variant_get(response, "(@a(yqqs)i&s)", &values, &status, &message);
+    index_batched_values(values, value_index);
+  } else {
+    g_debug("GetMultipleVcp failed, reading codes singly: %s", error->message);
+  }
+
+  for (guint i = tasks->len; i-- > 0;) {
+    GTask *task = g_ptr_array_index(tasks, i);
+    PendingCall *call = g_task_get_task_data(task);
+    guint8 code = 0;
+    g_variant_get_child(call->parameters, 2, "y", &code);
+
+    if (status != 0 || value_index[code] < 0) {
+      call->unbatched = TRUE;
+      g_queue_push_head(&lane->queue, g_object_ref(task));
+    }
+  }
+
+  finish_lane_call(self, lane);
+
+  for (guint i = 0; status == 0 && i < tasks->len; i++) {
+    GTask *task = g_ptr_array_index(tasks, i);
+    PendingCall *call = g_task_get_task_data(task);
+    guint8 code = 0;
+    g_variant_get_child(call->parameters, 2, "y", &code);
+
+    if (value_index[code] >= 0) {
+      GVariant *value = build_batched_value(values, value_index[code], status, message);
+      return_followers(self, task, value, NULL);
+      return_response(self, task, value);
+    }
+  }
+}
+
+static gboolean
+dispatch_get_vcp_batch(GnomeDdcClient *self, CallLane *lane, GTask *task)
+{
+  PendingCall *call = g_task_get_task_data(task);
+  if (!(call->flags & METHOD_FLAG_GET_VCP) || call->unbatched || g_task_get_cancellable(task) != NULL ||
+      lane->queue.head == NULL || !can_batch_get_vcp(task, lane->queue.head->data)) {
+    return FALSE;
+  }
+
+  GPtrArray *tasks = g_ptr_array_new_with_free_func(g_object_unref);
+  g_ptr_array_add(tasks, task);
+  while (lane->queue.head != NULL && can_batch_get_vcp(task, lane->queue.head->data)) {
+    g_ptr_array_add(tasks, g_queue_pop_head(&lane->queue));
+  }
+
+  g_autoptr(GByteArray) codes = g_byte_array_sized_new(tasks->len);
+  for (guint i = 0; i < tasks->len; i++) {
+    PendingCall *batched = g_task_get_task_data(g_ptr_array_index(tasks, i));
+    guint8 code = 0;
+    g_variant_get_child(batched->parameters, 2, "y", &code);
+    g_byte_array_append(codes, &code, 1);
+  }
+
+  g_autoptr(GBytes) code_bytes = g_byte_array_free_to_bytes(g_steal_pointer(&codes));
+  gint display_number = 0;
+  const gchar *edid = NULL;
+  guint32 flags = 0;
+  g_variant_get(call->parameters, "(i&syu)", &display_number, &edid, NULL, &flags);
+
+  begin_lane_call(self, lane);
+  g_dbus_proxy_call(self->proxy,
+                    "GetMultipleVcp",
+                    g_variant_new("(is@ayu)",
+                                  display_number,
+                                  edid,
+                                  g_variant_new_from_bytes(G_VARIANT_TYPE_BYTESTRING, code_bytes, TRUE),
+                                  flags),
+                    G_DBUS_CALL_FLAGS_NONE,
+                    -1,
+                    NULL,
+                    batch_ready_cb,
+                    tasks);
+  return TRUE;
+}
+
+static void
+dispatch_next_call(GnomeDdcClient *self, CallLane *lane)
+{
+  if (lane->in_flight || self->proxy == NULL || self->calls_in_flight >= MAX_CALLS_IN_FLIGHT) {
+    return;
+  }
+
+  GTask *task = g_queue_pop_head(&lane->queue);
+  if (task == NULL) {
+    return;
+  }
+
+  if (dispatch_get_vcp_batch(self, lane, task)) {
+    return;
+  }
+
+  PendingCall *call = g_task_get_task_data(task);
+  begin_lane_call(self, lane);
+  g_dbus_proxy_call(self->proxy,
+                    call->method,
+                    call->parameters,
+                    G_DBUS_CALL_FLAGS_NONE,
+                    -1,
+                    g_task_get_cancellable(task),
+                    call_ready_cb,
+                    task);
+}
+
+static void
+submit_call(GnomeDdcClient *self, GTask *task)
+{
+  PendingCall *call = g_task_get_task_data(task);
+
+  if (call->write_key != NULL && supersede_queued_write(call->lane, task)) {
+    return;
+  }
+
+  if (call->cache_key != NULL && join_pending_read(self, task)) {
+    return;
+  }
+
+  enqueue_call(call->lane, task);
+  mark_lane_ready(self, call->lane);
+  dispatch_ready_lanes(self);
+}
+
+static void
+capabilities_loaded_cb(GObject *source, GAsyncResult *result, gpointer user_data)
+{
+  GTask *task = user_data;
+  GnomeDdcClient *self = g_task_get_source_object(task);
+  PendingCall *call = g_task_get_task_data(task);
+  g_autoptr(GBytes) bytes = g_file_load_bytes_finish(G_FILE(source), result, NULL, NULL);
+  GVariant *cached = NULL;
+
+  if (bytes != NULL && call->capabilities_generation == self->capabilities_generation) {
+    cached = decode_capabilities(bytes, call->reply_type);
+  }
+
+  if (cached != NULL) {
+    g_hash_table_replace(self->capabilities_cache, g_bytes_ref(call->cache_key), g_variant_ref(cached));
+    g_task_return_pointer(task, cached, (GDestroyNotify) g_variant_unref);
+    g_object_unref(task);
+    return;
+  }
+
+  if (self->proxy == NULL && !self->connecting) {
+    g_task_return_new_error(task, G_IO_ERROR, G_IO_ERROR_FAILED, "%s", self->last_error ? self->last_error : "Proxy unavailable");
+    g_object_unref(task);
+    return;
+  }
+
+  submit_call(self, task);
+}
+
 void
 gnomeddc_client_call_async(GnomeDdcClient *self,
                                 const gchar *method,
@@ -141,67 +954,113 @@ gnomeddc_client_call_async(GnomeDdcClient *self,
                                 GCancellable *cancellable,
                                 GAsyncReadyCallback callback,
                                 gpointer user_data)
+{
+  gnomeddc_client_call_full_async(self,
+                                  method,
+                                  parameters,
+                                  GNOMEDDC_CLIENT_CALL_NONE,
+                                  cancellable,
+                                  callback,
+                                  user_data);
+}
+
+void
+gnomeddc_client_call_full_async(GnomeDdcClient *self,
+                                const gchar *method,
+                                GVariant *parameters,
+                                GnomeDdcClientCallFlags call_flags,
+                                GCancellable *cancellable,
+                                GAsyncReadyCallback callback,
+                                gpointer user_data)
 {
   g_return_if_fail(GNOMEDDC_IS_CLIENT(self));
   g_return_if_fail(method != NULL);
 
-  if (self->proxy == NULL) {
-    GTask *task = g_task_new(self, cancellable, callback, user_data);
+  GTask *task = g_task_new(self, cancellable, callback, user_data);
+  g_task_set_source_tag(task, gnomeddc_client_call_full_async);
+
+  if (self->proxy == NULL && !self->connecting) {
     g_task_return_new_error(task, G_IO_ERROR, G_IO_ERROR_FAILED, "%s", self->last_error ? self->last_error : "Proxy unavailable");
     g_object_unref(task);
     return;
   }
 
-  GVariant *params = ensure_parameters(parameters);
-  g_dbus_proxy_call(self->proxy,
-                    method,
-                    params,
-                    G_DBUS_CALL_FLAGS_NONE,
-                    -1,
-                    cancellable,
-                    callback,
-                    user_data);
-  g_variant_unref(params);
-}
+  PendingCall *call = g_new0(PendingCall, 1);
+  call->method = g_strdup(method);
+  call->parameters = ensure_parameters(parameters);
+  const gchar *reply_type;
+  call->flags = lookup_method_flags(method, &reply_type);
+  call->reply_type = reply_type;
+  call->lane = lookup_call_lane(self, lane_key_for_parameters(call->parameters));
 
-GVariant *
-gnomeddc_client_call_finish(GnomeDdcClient *self,
-                                      GAsyncResult *result,
-                                      GError **error)
-{
-  g_return_val_if_fail(GNOMEDDC_IS_CLIENT(self), NULL);
-  g_return_val_if_fail(G_IS_ASYNC_RESULT(result), NULL);
+  GVariant *cached = NULL;
+  gboolean load_from_disk = FALSE;
+  if (call->flags & METHOD_FLAG_CAPABILITIES) {
+    const gchar *edid = lane_key_for_parameters(call->parameters);
+    if (*edid != '\0') {
+      call->cache_key = build_cache_key(method, edid, strlen(edid));
+      if (call_flags & GNOMEDDC_CLIENT_CALL_REFRESH) {
+        g_autoptr(GFile) file = get_capabilities_cache_file(method, edid);
+        g_hash_table_remove(self->capabilities_cache, call->cache_key);
+        self->capabilities_generation++;
+        gnomeddc_cache_delete_async(file);
+      } else if ((cached = g_hash_table_lookup(self->capabilities_cache, call->cache_key)) != NULL) {
+        g_variant_ref(cached);
+      } else {
+        load_from_disk = TRUE;
+      }
+    }
+  } else if (call->flags & METHOD_FLAG_CACHEABLE) {
+    call->cache_key = build_cache_key(method,
+                                      g_variant_get_data(call->parameters),
+                                      g_variant_get_size(call->parameters));
+    cached = lookup_cached_response(self, call->cache_key);
+  } else if (call->flags & METHOD_FLAG_COALESCE) {
+    call->cache_key = build_cache_key(method,
+                                      g_variant_get_data(call->parameters),
+                                      g_variant_get_size(call->parameters));
+  } else if (call->flags & METHOD_FLAG_VCP_WRITE) {
+    call->lane->generation++;
+  }
 
-  if (self->proxy == NULL) {
-    g_set_error(error, G_IO_ERROR, G_IO_ERROR_FAILED, "%s", self->last_error ? self->last_error : "Proxy unavailable");
-    return NULL;
+  if (cached != NULL) {
+    g_task_return_pointer(task, cached, (GDestroyNotify) g_variant_unref);
+    g_object_unref(task);
+    pending_call_free(call);
+    return;
   }
 
-  return g_dbus_proxy_call_finish(self->proxy, result, error);
+  call->generation = call->lane->generation;
+  if (call_flags & GNOMEDDC_CLIENT_CALL_SUPERSEDE) {
+    call->write_key = build_write_key(call);
+  }
+  g_task_set_task_data(task, call, (GDestroyNotify) pending_call_free);
+  if (load_from_disk) {
+    g_autoptr(GFile) file = get_capabilities_cache_file(method, lane_key_for_parameters(call->parameters));
+    call->capabilities_generation = self->capabilities_generation;
+    g_file_load_bytes_async(file, cancellable, capabilities_loaded_cb, task);
+    return;
+  }
+
+  submit_call(self, task);
 }
 
 GVariant *
-gnomeddc_client_get_cached_property(GnomeDdcClient *self,
-                                              const gchar *property_name)
+gnomeddc_client_call_finish(GnomeDdcClient *self,
+                                      GAsyncResult *result,
+                                      GError **error)
 {
   g_return_val_if_fail(GNOMEDDC_IS_CLIENT(self), NULL);
-  g_return_val_if_fail(property_name != NULL, NULL);
-
-  if (self->proxy == NULL) {
-    return NULL;
-  }
+  g_return_val_if_fail(g_task_is_valid(result, self), NULL);
 
-  GVariant *value = g_dbus_proxy_get_cached_property(self->proxy, property_name);
-  if (value != NULL) {
-    return g_variant_ref(value);
-  }
-  return NULL;
+  return g_task_propagate_pointer(G_TASK(result), error);
 }
 
 void
 gnomeddc_client_set_property_async(GnomeDdcClient *self,
                                         const gchar *property_name,
                                         GVariant *value,
+                                        GnomeDdcClientCallFlags call_flags,
                                         GCancellable *cancellable,
                                         GAsyncReadyCallback callback,
                                         gpointer user_data)
@@ -209,21 +1068,13 @@ gnomeddc_client_set_property_async(GnomeDdcClient *self,
   g_return_if_fail(GNOMEDDC_IS_CLIENT(self));
   g_return_if_fail(property_name != NULL);
 
-  if (self->proxy == NULL) {
-    GTask *task = g_task_new(self, cancellable, callback, user_data);
-    g_task_return_new_error(task, G_IO_ERROR, G_IO_ERROR_FAILED, "%s", self->last_error ? self->last_error : "Proxy unavailable");
-    g_object_unref(task);
-    return;
-  }
-
-  g_dbus_proxy_call(self->proxy,
-                    "org.freedesktop.DBus.Properties.Set",
-                    g_variant_new("(ssv)", DDCUTIL_INTERFACE_NAME, property_name, value),
-                    G_DBUS_CALL_FLAGS_NONE,
-                    -1,
-                    cancellable,
-                    callback,
-                    user_data);
+  gnomeddc_client_call_full_async(self,
+                                  "org.freedesktop.DBus.Properties.Set",
+                                  g_variant_new("(ssv)", DDCUTIL_INTERFACE_NAME, property_name, value),
+                                  call_flags,
+                                  cancellable,
+                                  callback,
+                                  user_data);
 }
 
 GVariant *
@@ -231,13 +1082,5 @@ gnomeddc_client_set_property_finish(GnomeDdcClient *self,
                                               GAsyncResult *result,
                                               GError **error)
 {
-  g_return_val_if_fail(GNOMEDDC_IS_CLIENT(self), NULL);
-  g_return_val_if_fail(G_IS_ASYNC_RESULT(result), NULL);
-
-  if (self->proxy == NULL) {
-    g_set_error(error, G_IO_ERROR, G_IO_ERROR_FAILED, "%s", self->last_error ? self->last_error : "Proxy unavailable");
-    return NULL;
-  }
-
-  return g_dbus_proxy_call_finish(self->proxy, result, error);
+  return gnomeddc_client_call_finish(self, result, error);
 }
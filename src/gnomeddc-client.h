@@ -5,6 +5,10 @@
 
 G_BEGIN_DECLS
 
+#define DDCUTIL_SERVICE_NAME "com.ddcutil.DdcutilService"
+#define DDCUTIL_OBJECT_PATH "/com/ddcutil/DdcutilObject"
+#define DDCUTIL_INTERFACE_NAME "com.ddcutil.DdcutilInterface"
+
 #define GNOMEDDC_TYPE_CLIENT (gnomeddc_client_get_type())
 
 typedef struct _GnomeDdcClient GnomeDdcClient;
@@ -14,6 +18,12 @@ typedef enum {
   GNOMEDDC_CLIENT_BUS_SESSION
 } GnomeDdcClientBusType;
 
+typedef enum {
+  GNOMEDDC_CLIENT_CALL_NONE = 0,
+  GNOMEDDC_CLIENT_CALL_SUPERSEDE = 1 << 0,
+  GNOMEDDC_CLIENT_CALL_REFRESH = 1 << 1
+} GnomeDdcClientCallFlags;
+
 G_DECLARE_FINAL_TYPE(GnomeDdcClient, gnomeddc_client, GNOMEDDC, CLIENT, GObject)
 
 GnomeDdcClient *gnomeddc_client_new(void);
@@ -30,16 +40,22 @@ void gnomeddc_client_call_async(GnomeDdcClient *self,
                                 GAsyncReadyCallback callback,
                                 gpointer user_data);
 
+void gnomeddc_client_call_full_async(GnomeDdcClient *self,
+                                     const gchar *method,
+                                     GVariant *parameters,
+                                     GnomeDdcClientCallFlags call_flags,
+                                     GCancellable *cancellable,
+                                     GAsyncReadyCallback callback,
+                                     gpointer user_data);
+
 GVariant *gnomeddc_client_call_finish(GnomeDdcClient *self,
                                       GAsyncResult *result,
                                       GError **error);
 
-GVariant *gnomeddc_client_get_cached_property(GnomeDdcClient *self,
-                                              const gchar *property_name);
-
 void gnomeddc_client_set_property_async(GnomeDdcClient *self,
                                         const gchar *property_name,
                                         GVariant *value,
+                                        GnomeDdcClientCallFlags call_flags,
                                         GCancellable *cancellable,
                                         GAsyncReadyCallback callback,
                                         gpointer user_data);
@@ -1,17 +1,26 @@
 #include "gnomeddc-display.h"
 
+#include <glib/gi18n.h>
+
 struct _GnomeDdcDisplay {
   GObject parent_instance;
 
   gint display_number;
   gint usb_bus;
   gint usb_device;
-  gchar *manufacturer;
-  gchar *model;
-  gchar *serial;
-  guint16 product_code;
-  gchar *edid;
   guint32 binary_serial;
+  guint16 product_code;
+  GVariant *entry;
+  const gchar *manufacturer;
+  const gchar *model;
+  const gchar *serial;
+  const gchar *edid;
+  gchar *search_text;
+  gchar *full_name;
+  gchar *subtitle;
+  gchar *product_code_label;
+  gchar *display_number_label;
+  gchar *usb_location;
 };
 
 G_DEFINE_FINAL_TYPE(GnomeDdcDisplay, gnomeddc_display, G_TYPE_OBJECT)
@@ -21,10 +30,13 @@ gnomeddc_display_finalize(GObject *object)
 {
   GnomeDdcDisplay *self = GNOMEDDC_DISPLAY(object);
 
-  g_clear_pointer(&self->manufacturer, g_free);
-  g_clear_pointer(&self->model, g_free);
-  g_clear_pointer(&self->serial, g_free);
-  g_clear_pointer(&self->edid, g_free);
+  g_clear_pointer(&self->entry, g_variant_unref);
+  g_clear_pointer(&self->search_text, g_free);
+  g_clear_pointer(&self->full_name, g_free);
+  g_clear_pointer(&self->subtitle, g_free);
+  g_clear_pointer(&self->product_code_label, g_free);
+  g_clear_pointer(&self->display_number_label, g_free);
+  g_clear_pointer(&self->usb_location, g_free);
 
   G_OBJECT_CLASS(gnomeddc_display_parent_class)->finalize(object);
 }
@@ -41,27 +53,46 @@ gnomeddc_display_init(GnomeDdcDisplay *self)
 {
 }
 
+static gchar *
+build_full_name(const gchar *manufacturer, const gchar *model)
+{
+  if (manufacturer[0] == '\0' && model[0] == '\0') {
+    return g_strdup("Display");
+  }
+
+  if (manufacturer[0] == '\0') {
+    return g_strdup(model);
+  }
+
+  if (model[0] == '\0') {
+    return g_strdup(manufacturer);
+  }
+
+  return g_strdup_printf("%s %s", manufacturer, model);
+}
+
 GnomeDdcDisplay *
-gnomeddc_display_new(gint display_number,
-                      gint usb_bus,
-                      gint usb_device,
-                      const gchar *manufacturer,
-                      const gchar *model,
-                      const gchar *serial,
-                      guint16 product_code,
-                      const gchar *edid,
-                      guint32 binary_serial)
+gnomeddc_display_new(GVariant *entry)
 {
+  g_return_val_if_fail(g_variant_is_of_type(entry, G_VARIANT_TYPE("(iiisssqsu)")), NULL);
+
   GnomeDdcDisplay *self = g_object_new(GNOMEDDC_TYPE_DISPLAY, NULL);
-  self->display_number = display_number;
-  self->usb_bus = usb_bus;
-  self->usb_device = usb_device;
-  self->manufacturer = g_strdup(manufacturer ? manufacturer : "");
-  self->model = g_strdup(model ? model : "");
-  self->serial = g_strdup(serial ? serial : "");
-  self->product_code = product_code;
-  self->edid = g_strdup(edid ? edid : "");
-  self->binary_serial = binary_serial;
+  self->entry = g_variant_ref_sink(entry);
+  g_variant_get(self->entry, "(iii&s&s&sq&su)",
+                &self->display_number,
+                &self->usb_bus,
+                &self->usb_device,
+                &self->manufacturer,
+                &self->model,
+                &self->serial,
+                &self->product_code,
+                &self->edid,
+                &self->binary_serial);
+  self->full_name = build_full_name(self->manufacturer, self->model);
+  self->subtitle = g_strdup_printf(_("Display %d — %s"), self->display_number, self->serial);
+  self->product_code_label = g_strdup_printf("0x%04X", self->product_code);
+  self->display_number_label = g_strdup_printf("%d", self->display_number);
+  self->usb_location = g_strdup_printf("Bus %d • Device %d", self->usb_bus, self->usb_device);
   return self;
 }
 
@@ -121,6 +152,19 @@ gnomeddc_display_get_edid(GnomeDdcDisplay *self)
   return self->edid;
 }
 
+const gchar *
+gnomeddc_display_get_search_text(GnomeDdcDisplay *self)
+{
+  g_return_val_if_fail(GNOMEDDC_IS_DISPLAY(self), "");
+
+  if (self->search_text == NULL) {
+    g_autofree gchar *text = g_strjoin("\n", self->full_name, self->serial, self->edid, NULL);
+    self->search_text = g_utf8_casefold(text, -1);
+  }
+
+  return self->search_text;
+}
+
 guint32
 gnomeddc_display_get_binary_serial(GnomeDdcDisplay *self)
 {
@@ -128,22 +172,37 @@ gnomeddc_display_get_binary_serial(GnomeDdcDisplay *self)
   return self->binary_serial;
 }
 
-char *
-gnomeddc_display_dup_full_name(GnomeDdcDisplay *self)
+const gchar *
+gnomeddc_display_get_full_name(GnomeDdcDisplay *self)
 {
-  g_return_val_if_fail(GNOMEDDC_IS_DISPLAY(self), NULL);
+  g_return_val_if_fail(GNOMEDDC_IS_DISPLAY(self), "");
+  return self->full_name;
+}
 
-  if (self->manufacturer[0] == '\0' && self->model[0] == '\0') {
-    return g_strdup("Display");
-  }
+const gchar *
+gnomeddc_display_get_subtitle(GnomeDdcDisplay *self)
+{
+  g_return_val_if_fail(GNOMEDDC_IS_DISPLAY(self), "");
+  return self->subtitle;
+}
 
-  if (self->manufacturer[0] == '\0') {
-    return g_strdup(self->model);
-  }
+const gchar *
+gnomeddc_display_get_product_code_label(GnomeDdcDisplay *self)
+{
+  g_return_val_if_fail(GNOMEDDC_IS_DISPLAY(self), "");
+  return self->product_code_label;
+}
 
-  if (self->model[0] == '\0') {
-    return g_strdup(self->manufacturer);
-  }
+const gchar *
+gnomeddc_display_get_display_number_label(GnomeDdcDisplay *self)
+{
+  g_return_val_if_fail(GNOMEDDC_IS_DISPLAY(self), "");
+  return self->display_number_label;
+}
 
-  return g_strdup_printf("%s %s", self->manufacturer, self->model);
+const gchar *
+gnomeddc_display_get_usb_location(GnomeDdcDisplay *self)
+{
+  g_return_val_if_fail(GNOMEDDC_IS_DISPLAY(self), "");
+  return self->usb_location;
 }
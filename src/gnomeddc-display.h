@@ -9,15 +9,7 @@ G_BEGIN_DECLS
 
 G_DECLARE_FINAL_TYPE(GnomeDdcDisplay, gnomeddc_display, GNOMEDDC, DISPLAY, GObject)
 
-GnomeDdcDisplay *gnomeddc_display_new(gint display_number,
-                                      gint usb_bus,
-                                      gint usb_device,
-                                      const gchar *manufacturer,
-                                      const gchar *model,
-                                      const gchar *serial,
-                                      guint16 product_code,
-                                      const gchar *edid,
-                                      guint32 binary_serial);
+GnomeDdcDisplay *gnomeddc_display_new(GVariant *entry);
 
 gint gnomeddc_display_get_display_number(GnomeDdcDisplay *self);
 gint gnomeddc_display_get_usb_bus(GnomeDdcDisplay *self);
@@ -27,8 +19,13 @@ const gchar *gnomeddc_display_get_model(GnomeDdcDisplay *self);
 const gchar *gnomeddc_display_get_serial(GnomeDdcDisplay *self);
 guint16 gnomeddc_display_get_product_code(GnomeDdcDisplay *self);
 const gchar *gnomeddc_display_get_edid(GnomeDdcDisplay *self);
+const gchar *gnomeddc_display_get_search_text(GnomeDdcDisplay *self);
 guint32 gnomeddc_display_get_binary_serial(GnomeDdcDisplay *self);
-char *gnomeddc_display_dup_full_name(GnomeDdcDisplay *self);
+const gchar *gnomeddc_display_get_full_name(GnomeDdcDisplay *self);
+const gchar *gnomeddc_display_get_subtitle(GnomeDdcDisplay *self);
+const gchar *gnomeddc_display_get_product_code_label(GnomeDdcDisplay *self);
+const gchar *gnomeddc_display_get_display_number_label(GnomeDdcDisplay *self);
+const gchar *gnomeddc_display_get_usb_location(GnomeDdcDisplay *self);
 
 G_END_DECLS
 
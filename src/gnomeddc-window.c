@@ -1,12 +1,20 @@
 #include "gnomeddc-window.h"
 
+#include "gnomeddc-cache.h"
 #include "gnomeddc-client.h"
 #include "gnomeddc-display.h"
 
 #include <glib/gi18n.h>
 #include <math.h>
 
-#define DDCUTIL_INTERFACE_NAME "com.ddcutil.DdcutilInterface"
+#define SPIN_ROW_WRITE_DELAY_MS 150
+#define DISPLAYS_CHANGED_DELAY_S 1
+#define DDCA_EVENT_DPMS_AWAKE 0
+#define DDCA_EVENT_DPMS_ASLEEP 1
+#define VCP_CHANGE_TOAST_INTERVAL (500 * G_TIME_SPAN_MILLISECOND)
+#define SLEEP_MULTIPLIER_ENV "GNOMEDDC_SLEEP_MULTIPLIER"
+#define SLEEP_MULTIPLIER_EXCLUDE_ENV "GNOMEDDC_SLEEP_MULTIPLIER_EXCLUDE"
+#define DISPLAY_CACHE_TYPE "a(iiisssqsu)"
 
 struct _GnomeDdcWindow {
   AdwApplicationWindow parent_instance;
@@ -18,7 +26,27 @@ struct _GnomeDdcWindow {
   GtkSingleSelection *selection;
   gchar *search_text;
   guint pending_calls;
-  gboolean updating_service_properties;
+  gboolean displays_detected;
+  gboolean service_properties_loaded;
+  GHashTable *service_properties;
+  GVariant *display_array;
+  GHashTable *known_edids;
+  GHashTable *sleep_multiplier_restore;
+  GHashTable *sleep_multiplier_user_set;
+  gdouble sleep_multiplier_override;
+  GStrv sleep_multiplier_excluded;
+  GCancellable *sleep_multiplier_cancellable;
+  guint spin_write_source_id;
+  guint displays_changed_source_id;
+  GHashTable *vcp_toast_times;
+  GString *vcp_toast_key;
+  AdwToast *vcp_toast;
+  gchar *vcp_toast_source;
+  guint vcp_toast_changes;
+  gdouble output_level_sent;
+  gdouble poll_interval_sent;
+  gdouble poll_cascade_sent;
+  guint spin_rows_changed;
 
   AdwToastOverlay *toast_overlay;
   GtkListView *display_list;
@@ -87,10 +115,19 @@ struct _GnomeDdcWindow {
 
   GtkTextView *capabilities_text_view;
   GtkWidget *view_stack;
+  GtkWidget *service_page;
 };
 
 G_DEFINE_FINAL_TYPE(GnomeDdcWindow, gnomeddc_window, ADW_TYPE_APPLICATION_WINDOW)
 
+enum {
+  PROP_0,
+  PROP_CLIENT,
+  N_PROPS
+};
+
+static GParamSpec *properties[N_PROPS];
+
 
 static void gnomeddc_window_start_operation(GnomeDdcWindow *self);
 static void gnomeddc_window_finish_operation(GnomeDdcWindow *self);
@@ -99,6 +136,8 @@ static void gnomeddc_window_update_selection(GnomeDdcWindow *self);
 static void gnomeddc_window_refresh_service_properties(GnomeDdcWindow *self);
 static void gnomeddc_window_query_state(GnomeDdcWindow *self);
 static void gnomeddc_window_query_sleep_multiplier(GnomeDdcWindow *self);
+static void service_switch_toggled_cb(AdwSwitchRow *row, GParamSpec *pspec, gpointer user_data);
+static void spin_row_value_changed_cb(GObject *object, GParamSpec *pspec, gpointer user_data);
 
 static gboolean
 display_filter_func(gpointer item, gpointer user_data)
@@ -108,23 +147,7 @@ display_filter_func(gpointer item, gpointer user_data)
     return TRUE;
   }
 
-  GnomeDdcDisplay *display = GNOMEDDC_DISPLAY(item);
-  g_autofree gchar *folded_search = g_utf8_casefold(self->search_text, -1);
-  g_autofree gchar *folded_manufacturer = g_utf8_casefold(gnomeddc_display_get_manufacturer(display), -1);
-  g_autofree gchar *folded_model = g_utf8_casefold(gnomeddc_display_get_model(display), -1);
-  g_autofree gchar *folded_serial = g_utf8_casefold(gnomeddc_display_get_serial(display), -1);
-  g_autofree gchar *folded_edid = g_utf8_casefold(gnomeddc_display_get_edid(display), -1);
-
-  if (strstr(folded_manufacturer, folded_search) != NULL ||
-      strstr(folded_model, folded_search) != NULL ||
-      strstr(folded_serial, folded_search) != NULL ||
-      strstr(folded_edid, folded_search) != NULL) {
-    return TRUE;
-  }
-
-  g_autofree gchar *full_name = gnomeddc_display_dup_full_name(display);
-  g_autofree gchar *folded_full_name = g_utf8_casefold(full_name, -1);
-  return strstr(folded_full_name, folded_search) != NULL;
+  return strstr(gnomeddc_display_get_search_text(GNOMEDDC_DISPLAY(item)), self->search_text) != NULL;
 }
 
 static void
@@ -208,127 +231,197 @@ update_overview_rows(GnomeDdcWindow *self, GnomeDdcDisplay *display)
     return;
   }
 
-  g_autofree gchar *full_name = gnomeddc_display_dup_full_name(display);
-  adw_action_row_set_subtitle(self->name_row, full_name);
+  adw_action_row_set_subtitle(self->name_row, gnomeddc_display_get_full_name(display));
   adw_action_row_set_subtitle(self->model_row, gnomeddc_display_get_model(display));
   adw_action_row_set_subtitle(self->manufacturer_row, gnomeddc_display_get_manufacturer(display));
   adw_action_row_set_subtitle(self->serial_row, gnomeddc_display_get_serial(display));
-  adw_action_row_set_subtitle(self->product_code_row,
-                              g_strdup_printf("0x%04X", gnomeddc_display_get_product_code(display)));
-  adw_action_row_set_subtitle(self->display_number_row,
-                              g_strdup_printf("%d", gnomeddc_display_get_display_number(display)));
-  adw_action_row_set_subtitle(self->usb_row,
-                              g_strdup_printf("Bus %d • Device %d",
-                                               gnomeddc_display_get_usb_bus(display),
-                                               gnomeddc_display_get_usb_device(display)));
+  adw_action_row_set_subtitle(self->product_code_row, gnomeddc_display_get_product_code_label(display));
+  adw_action_row_set_subtitle(self->display_number_row, gnomeddc_display_get_display_number_label(display));
+  adw_action_row_set_subtitle(self->usb_row, gnomeddc_display_get_usb_location(display));
   adw_action_row_set_subtitle(self->state_row, _("Press Refresh to query"));
   adw_action_row_set_subtitle(self->sleep_multiplier_row, _("Press Refresh to query"));
 }
 
 
+static void
+set_service_row_handlers_blocked(GnomeDdcWindow *self, gboolean blocked)
+{
+  GObject *switch_rows[] = {
+    G_OBJECT(self->dynamic_sleep_row),
+    G_OBJECT(self->info_logging_row),
+    G_OBJECT(self->connectivity_signals_row),
+  };
+  GObject *spin_rows[] = {
+    G_OBJECT(self->output_level_row),
+    G_OBJECT(self->poll_interval_row),
+    G_OBJECT(self->poll_cascade_row),
+  };
+
+  for (guint i = 0; i < G_N_ELEMENTS(switch_rows); i++) {
+    if (blocked) {
+      g_signal_handlers_block_by_func(switch_rows[i], service_switch_toggled_cb, self);
+    } else {
+      g_signal_handlers_unblock_by_func(switch_rows[i], service_switch_toggled_cb, self);
+    }
+  }
+
+  for (guint i = 0; i < G_N_ELEMENTS(spin_rows); i++) {
+    if (blocked) {
+      g_signal_handlers_block_by_func(spin_rows[i], spin_row_value_changed_cb, self);
+    } else {
+      g_signal_handlers_unblock_by_func(spin_rows[i], spin_row_value_changed_cb, self);
+    }
+  }
+}
+
+typedef enum {
+  SERVICE_ROW_STRING,
+  SERVICE_ROW_YES_NO,
+  SERVICE_ROW_STRING_LIST,
+  SERVICE_ROW_CODE_MAP,
+  SERVICE_ROW_FLAG_MAP,
+  SERVICE_ROW_SWITCH,
+  SERVICE_ROW_SPIN_UINT,
+  SERVICE_ROW_SPIN_DOUBLE
+} ServiceRowKind;
+
+typedef struct {
+  const gchar *key;
+  ServiceRowKind kind;
+  glong row_offset;
+  glong sent_offset;
+} ServicePropertyRow;
+
+static const ServicePropertyRow service_property_rows[] = {
+  { "ServiceInterfaceVersion", SERVICE_ROW_STRING, G_STRUCT_OFFSET(GnomeDdcWindow, service_version_row), -1 },
+  { "DdcutilVersion", SERVICE_ROW_STRING, G_STRUCT_OFFSET(GnomeDdcWindow, ddcutil_version_row), -1 },
+  { "ServiceParametersLocked", SERVICE_ROW_YES_NO, G_STRUCT_OFFSET(GnomeDdcWindow, service_parameters_locked_row), -1 },
+  { "AttributesReturnedByDetect", SERVICE_ROW_STRING_LIST, G_STRUCT_OFFSET(GnomeDdcWindow, attributes_row), -1 },
+  { "StatusValues", SERVICE_ROW_CODE_MAP, G_STRUCT_OFFSET(GnomeDdcWindow, status_values_row), -1 },
+  { "DisplayEventTypes", SERVICE_ROW_CODE_MAP, G_STRUCT_OFFSET(GnomeDdcWindow, display_event_types_row), -1 },
+  { "ServiceFlagOptions", SERVICE_ROW_FLAG_MAP, G_STRUCT_OFFSET(GnomeDdcWindow, flag_options_row), -1 },
+  { "DdcutilDynamicSleep", SERVICE_ROW_SWITCH, G_STRUCT_OFFSET(GnomeDdcWindow, dynamic_sleep_row), -1 },
+  { "ServiceInfoLogging", SERVICE_ROW_SWITCH, G_STRUCT_OFFSET(GnomeDdcWindow, info_logging_row), -1 },
+  { "ServiceEmitConnectivitySignals", SERVICE_ROW_SWITCH, G_STRUCT_OFFSET(GnomeDdcWindow, connectivity_signals_row), -1 },
+  { "DdcutilOutputLevel", SERVICE_ROW_SPIN_UINT, G_STRUCT_OFFSET(GnomeDdcWindow, output_level_row), G_STRUCT_OFFSET(GnomeDdcWindow, output_level_sent) },
+  { "ServicePollInterval", SERVICE_ROW_SPIN_UINT, G_STRUCT_OFFSET(GnomeDdcWindow, poll_interval_row), G_STRUCT_OFFSET(GnomeDdcWindow, poll_interval_sent) },
+  { "ServicePollCascadeInterval", SERVICE_ROW_SPIN_DOUBLE, G_STRUCT_OFFSET(GnomeDdcWindow, poll_cascade_row), G_STRUCT_OFFSET(GnomeDdcWindow, poll_cascade_sent) },
+};
+
+static GHashTable *service_property_index;
+
+static gchar *
+format_service_code_map(GVariant *value, gboolean hex)
+{
+  GVariantIter iter;
+  gint code;
+  const gchar *text_value;
+  g_autoptr(GString) str = g_string_new(NULL);
+
+  g_variant_iter_init(&iter, value);
+  while (g_variant_iter_next(&iter, "{i&s}", &code, &text_value)) {
+    if (str->len > 0) {
+      g_string_append_c(str, '\n');
+    }
+    if (hex) {
+      g_string_append_printf(str, "0x%X: %s", code, text_value);
+    } else {
+      g_string_append_printf(str, "%d: %s", code, text_value);
+    }
+  }
+
+  return g_string_free(g_steal_pointer(&str), FALSE);
+}
+
+static gchar *
+format_service_value(const ServicePropertyRow *entry, GVariant *value)
+{
+  switch (entry->kind) {
+  case SERVICE_ROW_STRING:
+    return g_variant_dup_string(value, NULL);
+  case SERVICE_ROW_YES_NO:
+    return g_strdup(g_variant_get_boolean(value) ? _("Yes") : _("No"));
+  case SERVICE_ROW_STRING_LIST: {
+    g_autofree const gchar **strv = g_variant_get_strv(value, NULL);
+    return g_strjoinv(", ", (gchar **) strv);
+  }
+  case SERVICE_ROW_CODE_MAP:
+    return format_service_code_map(value, FALSE);
+  case SERVICE_ROW_FLAG_MAP:
+    return format_service_code_map(value, TRUE);
+  default:
+    return NULL;
+  }
+}
+
+static void
+apply_service_property(GnomeDdcWindow *self, const ServicePropertyRow *entry, GVariant *value)
+{
+  gpointer row = G_STRUCT_MEMBER(gpointer, self, entry->row_offset);
+
+  switch (entry->kind) {
+  case SERVICE_ROW_SWITCH:
+    adw_switch_row_set_active(ADW_SWITCH_ROW(row), g_variant_get_boolean(value));
+    break;
+  case SERVICE_ROW_SPIN_UINT:
+    G_STRUCT_MEMBER(gdouble, self, entry->sent_offset) = g_variant_get_uint32(value);
+    adw_spin_row_set_value(ADW_SPIN_ROW(row), G_STRUCT_MEMBER(gdouble, self, entry->sent_offset));
+    break;
+  case SERVICE_ROW_SPIN_DOUBLE:
+    G_STRUCT_MEMBER(gdouble, self, entry->sent_offset) = g_variant_get_double(value);
+    adw_spin_row_set_value(ADW_SPIN_ROW(row), G_STRUCT_MEMBER(gdouble, self, entry->sent_offset));
+    break;
+  default: {
+    g_autofree gchar *text = format_service_value(entry, value);
+    adw_action_row_set_subtitle(ADW_ACTION_ROW(row), text);
+    break;
+  }
+  }
+}
+
 static void
 update_service_rows_from_dict(GnomeDdcWindow *self, GVariant *dict)
 {
-  self->updating_service_properties = TRUE;
+  set_service_row_handlers_blocked(self, TRUE);
 
   GVariantIter iter;
   const gchar *key;
   GVariant *value;
   g_variant_iter_init(&iter, dict);
-  while (g_variant_iter_loop(&iter, "{sv}", &key, &value)) {
-    if (g_strcmp0(key, "ServiceInterfaceVersion") == 0) {
-      adw_action_row_set_subtitle(self->service_version_row, g_variant_get_string(value, NULL));
-    } else if (g_strcmp0(key, "DdcutilVersion") == 0) {
-      adw_action_row_set_subtitle(self->ddcutil_version_row, g_variant_get_string(value, NULL));
-    } else if (g_strcmp0(key, "ServiceParametersLocked") == 0) {
-      adw_action_row_set_subtitle(self->service_parameters_locked_row,
-                                  g_variant_get_boolean(value) ? _("Yes") : _("No"));
-    } else if (g_strcmp0(key, "AttributesReturnedByDetect") == 0) {
-      GVariantIter array_iter;
-      const gchar *attr;
-      g_autoptr(GString) str = g_string_new(NULL);
-      g_variant_iter_init(&array_iter, value);
-      gboolean first = TRUE;
-      while (g_variant_iter_loop(&array_iter, "s", &attr)) {
-        if (!first) {
-          g_string_append(str, ", ");
-        }
-        first = FALSE;
-        g_string_append(str, attr);
-      }
-      adw_action_row_set_subtitle(self->attributes_row, str->str);
-    } else if (g_strcmp0(key, "StatusValues") == 0) {
-      GVariantIter status_iter;
-      gint code;
-      const gchar *text_value;
-      g_autoptr(GString) str = g_string_new(NULL);
-      gboolean first = TRUE;
-      g_variant_iter_init(&status_iter, value);
-      while (g_variant_iter_loop(&status_iter, "{is}", &code, &text_value)) {
-        if (!first) {
-          g_string_append_c(str, '\n');
-        }
-        first = FALSE;
-        g_string_append_printf(str, "%d: %s", code, text_value);
-      }
-      adw_action_row_set_subtitle(self->status_values_row, str->str);
-    } else if (g_strcmp0(key, "DisplayEventTypes") == 0) {
-      GVariantIter event_iter;
-      gint event_code;
-      const gchar *event_text;
-      g_autoptr(GString) str = g_string_new(NULL);
-      gboolean first = TRUE;
-      g_variant_iter_init(&event_iter, value);
-      while (g_variant_iter_loop(&event_iter, "{is}", &event_code, &event_text)) {
-        if (!first) {
-          g_string_append_c(str, '\n');
-        }
-        first = FALSE;
-        g_string_append_printf(str, "%d: %s", event_code, event_text);
-      }
-      adw_action_row_set_subtitle(self->display_event_types_row, str->str);
-    } else if (g_strcmp0(key, "ServiceFlagOptions") == 0) {
-      GVariantIter flag_iter;
-      gint flag;
-      const gchar *flag_name;
-      g_autoptr(GString) str = g_string_new(NULL);
-      gboolean first = TRUE;
-      g_variant_iter_init(&flag_iter, value);
-      while (g_variant_iter_loop(&flag_iter, "{is}", &flag, &flag_name)) {
-        if (!first) {
-          g_string_append_c(str, '\n');
-        }
-        first = FALSE;
-        g_string_append_printf(str, "0x%X: %s", flag, flag_name);
+  while (g_variant_iter_loop(&iter, "{&sv}", &key, &value)) {
+    const ServicePropertyRow *entry = g_hash_table_lookup(service_property_index, key);
+    if (entry == NULL) {
+      continue;
+    }
+
+    if (entry->kind < SERVICE_ROW_SWITCH) {
+      GVariant *previous = g_hash_table_lookup(self->service_properties, entry);
+      if (previous != NULL && g_variant_equal(previous, value)) {
+        continue;
       }
-      adw_action_row_set_subtitle(self->flag_options_row, str->str);
-    } else if (g_strcmp0(key, "DdcutilDynamicSleep") == 0) {
-      adw_switch_row_set_active(self->dynamic_sleep_row, g_variant_get_boolean(value));
-    } else if (g_strcmp0(key, "ServiceInfoLogging") == 0) {
-      adw_switch_row_set_active(self->info_logging_row, g_variant_get_boolean(value));
-    } else if (g_strcmp0(key, "ServiceEmitConnectivitySignals") == 0) {
-      adw_switch_row_set_active(self->connectivity_signals_row, g_variant_get_boolean(value));
-    } else if (g_strcmp0(key, "DdcutilOutputLevel") == 0) {
-      adw_spin_row_set_value(self->output_level_row, g_variant_get_uint32(value));
-    } else if (g_strcmp0(key, "ServicePollInterval") == 0) {
-      adw_spin_row_set_value(self->poll_interval_row, g_variant_get_uint32(value));
-    } else if (g_strcmp0(key, "ServicePollCascadeInterval") == 0) {
-      adw_spin_row_set_value(self->poll_cascade_row, g_variant_get_double(value));
+      g_hash_table_insert(self->service_properties, (gpointer) entry, g_variant_ref(value));
     }
+
+    apply_service_property(self, entry, value);
   }
 
-  self->updating_service_properties = FALSE;
+  set_service_row_handlers_blocked(self, FALSE);
 }
 
 static void
-handle_get_all_finished(GObject *source G_GNUC_UNUSED, GAsyncResult *result, gpointer user_data)
+handle_get_all_finished(GObject *source, GAsyncResult *result, gpointer user_data)
 {
-  GnomeDdcWindow *self = GNOMEDDC_WINDOW(user_data);
+  g_autoptr(GnomeDdcWindow) self = user_data;
   g_autoptr(GError) error = NULL;
-  g_autoptr(GVariant) response = gnomeddc_client_call_finish(self->client, result, &error);
+  g_autoptr(GVariant) response = gnomeddc_client_call_finish(GNOMEDDC_CLIENT(source), result, &error);
+  if (self->client == NULL) {
+    return;
+  }
+
   gnomeddc_window_finish_operation(self);
 
   if (error != NULL) {
+    self->service_properties_loaded = FALSE;
     show_toast(self, _("Failed to read service properties: %s"), error->message);
     return;
   }
@@ -350,13 +443,14 @@ gnomeddc_window_refresh_service_properties(GnomeDdcWindow *self)
     return;
   }
 
+  self->service_properties_loaded = TRUE;
   gnomeddc_window_start_operation(self);
   gnomeddc_client_call_async(self->client,
                              "org.freedesktop.DBus.Properties.GetAll",
                              g_variant_new("(s)", DDCUTIL_INTERFACE_NAME),
                              NULL,
                              handle_get_all_finished,
-                             self);
+                             g_object_ref(self));
 }
 
 static void
@@ -367,11 +461,277 @@ clear_capabilities_view(GnomeDdcWindow *self)
 }
 
 static void
-handle_list_finished(GObject *source G_GNUC_UNUSED, GAsyncResult *result, gpointer user_data)
+load_sleep_multiplier_override(GnomeDdcWindow *self)
 {
-  GnomeDdcWindow *self = GNOMEDDC_WINDOW(user_data);
+  const gchar *text = g_getenv(SLEEP_MULTIPLIER_ENV);
+  if (text == NULL || *text == '\0') {
+    return;
+  }
+
+  gchar *endptr = NULL;
+  gdouble value = g_ascii_strtod(text, &endptr);
+  if (endptr == NULL || *endptr != '\0' || value <= 0.0) {
+    g_warning("Ignoring invalid %s value: %s", SLEEP_MULTIPLIER_ENV, text);
+    return;
+  }
+
+  self->sleep_multiplier_override = value;
+
+  const gchar *excluded = g_getenv(SLEEP_MULTIPLIER_EXCLUDE_ENV);
+  if (excluded != NULL && *excluded != '\0') {
+    self->sleep_multiplier_excluded = g_strsplit(excluded, ",", -1);
+    for (guint i = 0; self->sleep_multiplier_excluded[i] != NULL; i++) {
+      g_strstrip(self->sleep_multiplier_excluded[i]);
+    }
+  }
+}
+
+typedef struct {
+  GnomeDdcWindow *self;
+  GnomeDdcDisplay *display;
+  gdouble multiplier;
+} SleepMultiplierOverride;
+
+static void
+sleep_multiplier_override_free(SleepMultiplierOverride *override)
+{
+  g_object_unref(override->self);
+  g_object_unref(override->display);
+  g_free(override);
+}
+
+static void
+handle_sleep_multiplier_override_finished(GObject *source, GAsyncResult *result, gpointer user_data)
+{
+  g_autofree gchar *edid = user_data;
+  g_autoptr(GError) error = NULL;
+  g_autoptr(GVariant) response = gnomeddc_client_call_finish(GNOMEDDC_CLIENT(source), result, &error);
+  gint status = 0;
+  const gchar *message = "";
+
+  if (response != NULL) {
+    g_variant_get(response, "(i&s)", &status, &message);
+  }
+  if (g_error_matches(error, G_IO_ERROR, G_IO_ERROR_CANCELLED)) {
+    return;
+  }
+  if (error != NULL || status != 0) {
+    g_warning("Unable to apply %s to display %s: %s",
+              SLEEP_MULTIPLIER_ENV, edid, error != NULL ? error->message : message);
+  }
+}
+
+static void
+handle_sleep_multiplier_saved(GObject *source, GAsyncResult *result, gpointer user_data)
+{
+  SleepMultiplierOverride *override = user_data;
+  GnomeDdcWindow *self = override->self;
+  const gchar *edid = gnomeddc_display_get_edid(override->display);
+  g_autoptr(GError) error = NULL;
+  g_autoptr(GVariant) response = gnomeddc_client_call_finish(GNOMEDDC_CLIENT(source), result, &error);
+  gdouble previous = 0.0;
+  gint status = 0;
+  const gchar *message = "";
+
+  if (response != NULL) {
+    g_variant_get(response, "(di&s)", &previous, &status, &message);
+  }
+  if (g_error_matches(error, G_IO_ERROR, G_IO_ERROR_CANCELLED)) {
+    sleep_multiplier_override_free(override);
+    return;
+  }
+  if (error != NULL || status != 0) {
+    g_warning("Not applying %s to display %s, unable to read its current multiplier: %s",
+              SLEEP_MULTIPLIER_ENV, edid, error != NULL ? error->message : message);
+    sleep_multiplier_override_free(override);
+    return;
+  }
+
+  if (self->sleep_multiplier_restore != NULL && !g_hash_table_contains(self->sleep_multiplier_restore, edid) &&
+      !g_hash_table_contains(self->sleep_multiplier_user_set, edid)) {
+    gint display_number = gnomeddc_display_get_display_number(override->display);
+    g_hash_table_insert(self->sleep_multiplier_restore,
+                        g_strdup(edid),
+                        g_variant_ref_sink(g_variant_new("(isdu)", display_number, edid, previous, 0)));
+    gnomeddc_client_call_async(GNOMEDDC_CLIENT(source),
+                               "SetSleepMultiplier",
+                               g_variant_new("(isdu)", display_number, edid, override->multiplier, 0),
+                               self->sleep_multiplier_cancellable,
+                               handle_sleep_multiplier_override_finished,
+                               g_strdup(edid));
+  }
+
+  sleep_multiplier_override_free(override);
+}
+
+static void
+apply_sleep_multiplier_override(GnomeDdcWindow *self, GnomeDdcDisplay *display)
+{
+  const gchar *edid = gnomeddc_display_get_edid(display);
+  const gchar *model = gnomeddc_display_get_model(display);
+  if (self->sleep_multiplier_override <= 0.0 ||
+      g_hash_table_contains(self->sleep_multiplier_restore, edid) ||
+      g_hash_table_contains(self->sleep_multiplier_user_set, edid) ||
+      (self->sleep_multiplier_excluded != NULL && model != NULL &&
+       g_strv_contains((const gchar * const *) self->sleep_multiplier_excluded, model))) {
+    return;
+  }
+
+  SleepMultiplierOverride *override = g_new0(SleepMultiplierOverride, 1);
+  override->self = g_object_ref(self);
+  override->display = g_object_ref(display);
+  override->multiplier = self->sleep_multiplier_override;
+  gnomeddc_client_call_async(self->client,
+                             "GetSleepMultiplier",
+                             g_variant_new("(isu)",
+                                           gnomeddc_display_get_display_number(display),
+                                           gnomeddc_display_get_edid(display),
+                                           0),
+                             self->sleep_multiplier_cancellable,
+                             handle_sleep_multiplier_saved,
+                             override);
+}
+
+static void
+restore_sleep_multipliers(GnomeDdcWindow *self)
+{
+  GDBusProxy *proxy = gnomeddc_client_get_proxy(self->client);
+  GHashTableIter iter;
+  gpointer parameters;
+
+  if (proxy == NULL || g_hash_table_size(self->sleep_multiplier_restore) == 0) {
+    return;
+  }
+
+  /* The main loop may not run again, so bypass the client's queues and flush. */
+  g_hash_table_iter_init(&iter, self->sleep_multiplier_restore);
+  while (g_hash_table_iter_next(&iter, NULL, &parameters)) {
+    g_dbus_proxy_call(proxy, "SetSleepMultiplier", parameters, G_DBUS_CALL_FLAGS_NONE, -1, NULL, NULL, NULL);
+  }
+  g_dbus_connection_flush_sync(g_dbus_proxy_get_connection(proxy), NULL, NULL);
+}
+
+static GFile *
+get_display_cache_file(void)
+{
+  g_autofree gchar *path = g_build_filename(g_get_user_cache_dir(), "gnomeddc", "displays.gvariant", NULL);
+  return g_file_new_for_path(path);
+}
+
+static void
+save_display_cache(GVariant *array)
+{
+  g_autoptr(GFile) file = get_display_cache_file();
+  g_autoptr(GBytes) bytes = g_variant_get_data_as_bytes(array);
+
+  gnomeddc_cache_write_async(file, bytes);
+}
+
+static gboolean
+display_entries_equal(GVariant *a, gsize a_index, GVariant *b, gsize b_index)
+{
+  g_autoptr(GVariant) a_entry = g_variant_get_child_value(a, a_index);
+  g_autoptr(GVariant) b_entry = g_variant_get_child_value(b, b_index);
+  return g_variant_equal(a_entry, b_entry);
+}
+
+static GPtrArray *
+displays_from_variant(GVariant *array, gsize start, gsize end)
+{
+  GPtrArray *displays = g_ptr_array_new_full(end - start, g_object_unref);
+
+  for (gsize i = start; i < end; i++) {
+    g_autoptr(GVariant) entry = g_variant_get_child_value(array, i);
+    g_ptr_array_add(displays, gnomeddc_display_new(entry));
+  }
+
+  return displays;
+}
+
+static gboolean
+set_displays(GnomeDdcWindow *self, GVariant *array)
+{
+  if (self->display_array != NULL && g_variant_equal(self->display_array, array)) {
+    return FALSE;
+  }
+
+  gsize old_n = self->display_array != NULL ? g_variant_n_children(self->display_array) : 0;
+  gsize new_n = g_variant_n_children(array);
+  gsize prefix = 0;
+  gsize suffix = 0;
+
+  while (prefix < old_n && prefix < new_n &&
+         display_entries_equal(self->display_array, prefix, array, prefix)) {
+    prefix++;
+  }
+  while (suffix < old_n - prefix && suffix < new_n - prefix &&
+         display_entries_equal(self->display_array, old_n - 1 - suffix, array, new_n - 1 - suffix)) {
+    suffix++;
+  }
+
+  g_clear_pointer(&self->display_array, g_variant_unref);
+  self->display_array = g_variant_ref(array);
+
+  g_autoptr(GnomeDdcDisplay) selected = get_selected_display(self);
+  g_autoptr(GPtrArray) displays = displays_from_variant(array, prefix, new_n - suffix);
+  for (guint i = 0; i < displays->len; i++) {
+    GnomeDdcDisplay *display = g_ptr_array_index(displays, i);
+    if (self->displays_detected && !g_hash_table_contains(self->known_edids, gnomeddc_display_get_edid(display))) {
+      apply_sleep_multiplier_override(self, display);
+    }
+  }
+  g_hash_table_remove_all(self->known_edids);
+  g_list_store_splice(self->display_store,
+                      prefix,
+                      old_n - prefix - suffix,
+                      displays->pdata,
+                      displays->len);
+
+  for (guint i = 0; i < g_list_model_get_n_items(G_LIST_MODEL(self->display_store)); i++) {
+    g_autoptr(GnomeDdcDisplay) display = g_list_model_get_item(G_LIST_MODEL(self->display_store), i);
+    g_hash_table_add(self->known_edids, (gpointer) gnomeddc_display_get_edid(display));
+  }
+
+  update_empty_state(self);
+  g_autoptr(GnomeDdcDisplay) now_selected = get_selected_display(self);
+  if (now_selected != selected) {
+    gnomeddc_window_update_selection(self);
+  }
+  return TRUE;
+}
+
+static void
+display_cache_loaded_cb(GObject *source, GAsyncResult *result, gpointer user_data)
+{
+  g_autoptr(GnomeDdcWindow) self = user_data;
+  g_autoptr(GBytes) bytes = g_file_load_bytes_finish(G_FILE(source), result, NULL, NULL);
+
+  if (bytes == NULL || self->display_store == NULL || self->displays_detected) {
+    return;
+  }
+
+  g_autoptr(GVariant) array = g_variant_ref_sink(g_variant_new_from_bytes(G_VARIANT_TYPE(DISPLAY_CACHE_TYPE), bytes, FALSE));
+  set_displays(self, array);
+}
+
+static void
+load_cached_displays(GnomeDdcWindow *self)
+{
+  g_autoptr(GFile) file = get_display_cache_file();
+
+  g_file_load_bytes_async(file, NULL, display_cache_loaded_cb, g_object_ref(self));
+}
+
+static void
+handle_list_finished(GObject *source, GAsyncResult *result, gpointer user_data)
+{
+  g_autoptr(GnomeDdcWindow) self = user_data;
   g_autoptr(GError) error = NULL;
-  g_autoptr(GVariant) response = gnomeddc_client_call_finish(self->client, result, &error);
+  g_autoptr(GVariant) response = gnomeddc_client_call_finish(GNOMEDDC_CLIENT(source), result, &error);
+  if (self->client == NULL) {
+    return;
+  }
+
   gnomeddc_window_finish_operation(self);
 
   if (error != NULL) {
@@ -385,50 +745,21 @@ handle_list_finished(GObject *source G_GNUC_UNUSED, GAsyncResult *result, gpoint
 
   gint ddc_status = 0;
   g_autofree gchar *message = NULL;
-  GVariant *array = NULL;
+  g_autoptr(GVariant) array = NULL;
   gint reported_count = 0;
-  g_variant_get(response, "(ia(iiisssqsu)is)", &reported_count, &array, &ddc_status, &message);
-
-  g_list_store_remove_all(self->display_store);
+  g_variant_get(response, "(i@" DISPLAY_CACHE_TYPE "is)", &reported_count, &array, &ddc_status, &message);
 
-  GVariantIter iter;
-  gint display_number;
-  gint usb_bus;
-  gint usb_device;
-  guint16 product_code;
-  guint32 binary_serial;
-  const gchar *manufacturer;
-  const gchar *model;
-  const gchar *serial;
-  const gchar *edid;
-
-  g_variant_iter_init(&iter, array);
-  while (g_variant_iter_loop(&iter, "(iiisssqsu)",
-                             &display_number,
-                             &usb_bus,
-                             &usb_device,
-                             &manufacturer,
-                             &model,
-                             &serial,
-                             &product_code,
-                             &edid,
-                             &binary_serial)) {
-    GnomeDdcDisplay *display = gnomeddc_display_new(display_number,
-                                                   usb_bus,
-                                                   usb_device,
-                                                   manufacturer,
-                                                   model,
-                                                   serial,
-                                                   product_code,
-                                                   edid,
-                                                   binary_serial);
-    g_list_store_append(self->display_store, display);
-    g_object_unref(display);
+  if (set_displays(self, array)) {
+    save_display_cache(array);
   }
-  g_variant_unref(array);
 
-  update_empty_state(self);
-  gnomeddc_window_update_selection(self);
+  if (!self->displays_detected) {
+    self->displays_detected = TRUE;
+    for (guint i = 0; i < g_list_model_get_n_items(G_LIST_MODEL(self->display_store)); i++) {
+      g_autoptr(GnomeDdcDisplay) display = g_list_model_get_item(G_LIST_MODEL(self->display_store), i);
+      apply_sleep_multiplier_override(self, display);
+    }
+  }
 
   show_toast(self, _("Detected %u displays (%s)"),
              g_list_model_get_n_items(G_LIST_MODEL(self->display_store)),
@@ -450,7 +781,7 @@ gnomeddc_window_refresh_displays(GnomeDdcWindow *self, gboolean detect)
                              g_variant_new("(u)", 0),
                              NULL,
                              handle_list_finished,
-                             self);
+                             g_object_ref(self));
 }
 
 static gboolean
@@ -513,45 +844,57 @@ parse_double_from_entry(AdwEntryRow *entry, gdouble *out_value)
   return TRUE;
 }
 
+static gboolean
+is_vcp_code_separator(gchar c)
+{
+  return c == ',' || c == ';' || c == ' ';
+}
+
 static GVariant *
 build_vcp_code_array(const gchar *text)
 {
-  if (text == NULL || *text == '\0') {
-    return g_variant_new_array(G_VARIANT_TYPE_BYTE, NULL, 0);
-  }
+  g_autoptr(GByteArray) codes = g_byte_array_new();
+  const gchar *cursor = text != NULL ? text : "";
 
-  g_autoptr(GPtrArray) codes = g_ptr_array_new();
-  gchar **parts = g_strsplit_set(text, ",; ", -1);
-  for (gint i = 0; parts[i] != NULL; i++) {
-    if (parts[i][0] == '\0') {
+  while (*cursor != '\0') {
+    if (is_vcp_code_separator(*cursor)) {
+      cursor++;
       continue;
     }
+
     gchar *endptr = NULL;
-    guint value = (guint) g_ascii_strtoull(parts[i], &endptr, 0);
-    if (endptr == NULL || *endptr != '\0' || value > G_MAXUINT8) {
-      g_strfreev(parts);
+    guint64 value = g_ascii_strtoull(cursor, &endptr, 0);
+    if (endptr == cursor || (*endptr != '\0' && !is_vcp_code_separator(*endptr)) || value > G_MAXUINT8) {
       return NULL;
     }
-    g_ptr_array_add(codes, GINT_TO_POINTER((gint) value));
-  }
-  g_strfreev(parts);
 
-  GVariantBuilder builder;
-  g_variant_builder_init(&builder, G_VARIANT_TYPE("ay"));
-  for (guint i = 0; i < codes->len; i++) {
-    guint8 code = (guint8) GPOINTER_TO_INT(g_ptr_array_index(codes, i));
-    g_variant_builder_add(&builder, "y", code);
+    guint8 code = (guint8) value;
+    g_byte_array_append(codes, &code, 1);
+    cursor = endptr;
   }
-  return g_variant_builder_end(&builder);
+
+  g_autoptr(GBytes) bytes = g_byte_array_free_to_bytes(g_steal_pointer(&codes));
+  return g_variant_ref_sink(g_variant_new_from_bytes(G_VARIANT_TYPE_BYTESTRING, bytes, TRUE));
 }
 
+static void
+append_vcp_code(GString *str, guint8 code)
+{
+  static const gchar hex_digits[] = "0123456789ABCDEF";
+  const gchar hex[4] = { '0', 'x', hex_digits[code >> 4], hex_digits[code & 0xF] };
+  g_string_append_len(str, hex, sizeof hex);
+}
 
 static void
-handle_get_state_finished(GObject *source G_GNUC_UNUSED, GAsyncResult *result, gpointer user_data)
+handle_get_state_finished(GObject *source, GAsyncResult *result, gpointer user_data)
 {
-  GnomeDdcWindow *self = GNOMEDDC_WINDOW(user_data);
+  g_autoptr(GnomeDdcWindow) self = user_data;
   g_autoptr(GError) error = NULL;
-  g_autoptr(GVariant) response = gnomeddc_client_call_finish(self->client, result, &error);
+  g_autoptr(GVariant) response = gnomeddc_client_call_finish(GNOMEDDC_CLIENT(source), result, &error);
+  if (self->client == NULL) {
+    return;
+  }
+
   gnomeddc_window_finish_operation(self);
 
   if (error != NULL) {
@@ -566,8 +909,8 @@ handle_get_state_finished(GObject *source G_GNUC_UNUSED, GAsyncResult *result, g
   gint status = 0;
   g_autofree gchar *message = NULL;
   g_variant_get(response, "(is)", &status, &message);
-  adw_action_row_set_subtitle(self->state_row,
-                              g_strdup_printf("%d — %s", status, message != NULL ? message : ""));
+  g_autofree gchar *subtitle = g_strdup_printf("%d — %s", status, message != NULL ? message : "");
+  adw_action_row_set_subtitle(self->state_row, subtitle);
 }
 
 static void
@@ -588,15 +931,19 @@ gnomeddc_window_query_state(GnomeDdcWindow *self)
                                            0),
                              NULL,
                              handle_get_state_finished,
-                             self);
+                             g_object_ref(self));
 }
 
 static void
-handle_get_sleep_multiplier_finished(GObject *source G_GNUC_UNUSED, GAsyncResult *result, gpointer user_data)
+handle_get_sleep_multiplier_finished(GObject *source, GAsyncResult *result, gpointer user_data)
 {
-  GnomeDdcWindow *self = GNOMEDDC_WINDOW(user_data);
+  g_autoptr(GnomeDdcWindow) self = user_data;
   g_autoptr(GError) error = NULL;
-  g_autoptr(GVariant) response = gnomeddc_client_call_finish(self->client, result, &error);
+  g_autoptr(GVariant) response = gnomeddc_client_call_finish(GNOMEDDC_CLIENT(source), result, &error);
+  if (self->client == NULL) {
+    return;
+  }
+
   gnomeddc_window_finish_operation(self);
 
   if (error != NULL) {
@@ -613,8 +960,8 @@ handle_get_sleep_multiplier_finished(GObject *source G_GNUC_UNUSED, GAsyncResult
   g_autofree gchar *message = NULL;
   g_variant_get(response, "(dis)", &multiplier, &status, &message);
 
-  adw_action_row_set_subtitle(self->sleep_multiplier_row,
-                              g_strdup_printf("%.3f (status %d)", multiplier, status));
+  g_autofree gchar *subtitle = g_strdup_printf("%.3f (status %d)", multiplier, status);
+  adw_action_row_set_subtitle(self->sleep_multiplier_row, subtitle);
   g_autofree gchar *text = g_strdup_printf("%.3f", multiplier);
   gtk_editable_set_text(GTK_EDITABLE(self->sleep_multiplier_entry), text);
 }
@@ -637,15 +984,19 @@ gnomeddc_window_query_sleep_multiplier(GnomeDdcWindow *self)
                                            0),
                              NULL,
                              handle_get_sleep_multiplier_finished,
-                             self);
+                             g_object_ref(self));
 }
 
 static void
-handle_set_sleep_multiplier_finished(GObject *source G_GNUC_UNUSED, GAsyncResult *result, gpointer user_data)
+handle_set_sleep_multiplier_finished(GObject *source, GAsyncResult *result, gpointer user_data)
 {
-  GnomeDdcWindow *self = GNOMEDDC_WINDOW(user_data);
+  g_autoptr(GnomeDdcWindow) self = user_data;
   g_autoptr(GError) error = NULL;
-  g_autoptr(GVariant) response = gnomeddc_client_call_finish(self->client, result, &error);
+  g_autoptr(GVariant) response = gnomeddc_client_call_finish(GNOMEDDC_CLIENT(source), result, &error);
+  if (self->client == NULL) {
+    return;
+  }
+
   gnomeddc_window_finish_operation(self);
 
   if (error != NULL) {
@@ -663,11 +1014,15 @@ handle_set_sleep_multiplier_finished(GObject *source G_GNUC_UNUSED, GAsyncResult
 }
 
 static void
-handle_get_vcp_finished(GObject *source G_GNUC_UNUSED, GAsyncResult *result, gpointer user_data)
+handle_get_vcp_finished(GObject *source, GAsyncResult *result, gpointer user_data)
 {
-  GnomeDdcWindow *self = GNOMEDDC_WINDOW(user_data);
+  g_autoptr(GnomeDdcWindow) self = user_data;
   g_autoptr(GError) error = NULL;
-  g_autoptr(GVariant) response = gnomeddc_client_call_finish(self->client, result, &error);
+  g_autoptr(GVariant) response = gnomeddc_client_call_finish(GNOMEDDC_CLIENT(source), result, &error);
+  if (self->client == NULL) {
+    return;
+  }
+
   gnomeddc_window_finish_operation(self);
 
   if (error != NULL) {
@@ -685,19 +1040,23 @@ handle_get_vcp_finished(GObject *source G_GNUC_UNUSED, GAsyncResult *result, gpo
   gint status = 0;
   g_autofree gchar *message = NULL;
   g_variant_get(response, "(qqsis)", &current, &max_value, &formatted, &status, &message);
-  adw_action_row_set_subtitle(self->get_vcp_row,
-                              g_strdup_printf(_("Value %u / %u (status %d) — %s"),
-                                              current, max_value, status,
-                                              formatted != NULL ? formatted : ""));
+  g_autofree gchar *subtitle = g_strdup_printf(_("Value %u / %u (status %d) — %s"),
+                                               current, max_value, status,
+                                               formatted != NULL ? formatted : "");
+  adw_action_row_set_subtitle(self->get_vcp_row, subtitle);
 }
 
 
 static void
-handle_get_multiple_vcp_finished(GObject *source G_GNUC_UNUSED, GAsyncResult *result, gpointer user_data)
+handle_get_multiple_vcp_finished(GObject *source, GAsyncResult *result, gpointer user_data)
 {
-  GnomeDdcWindow *self = GNOMEDDC_WINDOW(user_data);
+  g_autoptr(GnomeDdcWindow) self = user_data;
   g_autoptr(GError) error = NULL;
-  g_autoptr(GVariant) response = gnomeddc_client_call_finish(self->client, result, &error);
+  g_autoptr(GVariant) response = gnomeddc_client_call_finish(GNOMEDDC_CLIENT(source), result, &error);
+  if (self->client == NULL) {
+    return;
+  }
+
   gnomeddc_window_finish_operation(self);
 
   if (error != NULL) {
@@ -713,37 +1072,40 @@ handle_get_multiple_vcp_finished(GObject *source G_GNUC_UNUSED, GAsyncResult *re
   gint status = 0;
   g_autofree gchar *message = NULL;
   g_variant_get(response, "(@a(yqqs) is)", &array, &status, &message);
-  adw_action_row_set_subtitle(self->get_multiple_vcp_row,
-                              g_strdup_printf(_("Status %d — %s"), status,
-                                              message != NULL ? message : ""));
-
-  GtkTextBuffer *buffer = gtk_text_view_get_buffer(self->capabilities_text_view);
-  gtk_text_buffer_set_text(buffer, "", -1);
+  g_autofree gchar *subtitle = g_strdup_printf(_("Status %d — %s"), status,
+                                               message != NULL ? message : "");
+  adw_action_row_set_subtitle(self->get_multiple_vcp_row, subtitle);
 
+  g_autoptr(GString) text = g_string_new(NULL);
   GVariantIter iter;
   guint8 code;
   guint16 current;
   guint16 max_value;
   const gchar *formatted;
   g_variant_iter_init(&iter, array);
-  while (g_variant_iter_loop(&iter, "(yqqs)", &code, &current, &max_value, &formatted)) {
-    g_autofree gchar *line = g_strdup_printf("0x%02X — %u/%u — %s\n",
-                                             code,
-                                             current,
-                                             max_value,
-                                             formatted != NULL ? formatted : "");
-    gtk_text_buffer_insert_at_cursor(buffer, line, -1);
+  while (g_variant_iter_loop(&iter, "(yqq&s)", &code, &current, &max_value, &formatted)) {
+    append_vcp_code(text, code);
+    g_string_append_printf(text, " — %u/%u — %s\n",
+                           current,
+                           max_value,
+                           formatted != NULL ? formatted : "");
   }
-
   g_variant_unref(array);
+
+  GtkTextBuffer *buffer = gtk_text_view_get_buffer(self->capabilities_text_view);
+  gtk_text_buffer_set_text(buffer, text->str, text->len);
 }
 
 static void
-handle_set_vcp_finished(GObject *source G_GNUC_UNUSED, GAsyncResult *result, gpointer user_data)
+handle_set_vcp_finished(GObject *source, GAsyncResult *result, gpointer user_data)
 {
-  GnomeDdcWindow *self = GNOMEDDC_WINDOW(user_data);
+  g_autoptr(GnomeDdcWindow) self = user_data;
   g_autoptr(GError) error = NULL;
-  g_autoptr(GVariant) response = gnomeddc_client_call_finish(self->client, result, &error);
+  g_autoptr(GVariant) response = gnomeddc_client_call_finish(GNOMEDDC_CLIENT(source), result, &error);
+  if (self->client == NULL) {
+    return;
+  }
+
   gnomeddc_window_finish_operation(self);
 
   if (error != NULL) {
@@ -760,11 +1122,15 @@ handle_set_vcp_finished(GObject *source G_GNUC_UNUSED, GAsyncResult *result, gpo
 }
 
 static void
-handle_get_vcp_metadata_finished(GObject *source G_GNUC_UNUSED, GAsyncResult *result, gpointer user_data)
+handle_get_vcp_metadata_finished(GObject *source, GAsyncResult *result, gpointer user_data)
 {
-  GnomeDdcWindow *self = GNOMEDDC_WINDOW(user_data);
+  g_autoptr(GnomeDdcWindow) self = user_data;
   g_autoptr(GError) error = NULL;
-  g_autoptr(GVariant) response = gnomeddc_client_call_finish(self->client, result, &error);
+  g_autoptr(GVariant) response = gnomeddc_client_call_finish(GNOMEDDC_CLIENT(source), result, &error);
+  if (self->client == NULL) {
+    return;
+  }
+
   gnomeddc_window_finish_operation(self);
 
   if (error != NULL) {
@@ -802,8 +1168,6 @@ handle_get_vcp_metadata_finished(GObject *source G_GNUC_UNUSED, GAsyncResult *re
                                                status);
   adw_action_row_set_subtitle(self->get_vcp_metadata_row, subtitle);
 
-  GtkTextBuffer *buffer = gtk_text_view_get_buffer(self->capabilities_text_view);
-  gtk_text_buffer_set_text(buffer, "", -1);
   g_autofree gchar *details = g_strdup_printf("Description: %s\n"
                                               "Read only: %s\n"
                                               "Write only: %s\n"
@@ -816,15 +1180,20 @@ handle_get_vcp_metadata_finished(GObject *source G_GNUC_UNUSED, GAsyncResult *re
                                               is_rw ? "yes" : "no",
                                               is_complex ? "yes" : "no",
                                               is_continuous ? "yes" : "no");
-  gtk_text_buffer_insert_at_cursor(buffer, details, -1);
+  GtkTextBuffer *buffer = gtk_text_view_get_buffer(self->capabilities_text_view);
+  gtk_text_buffer_set_text(buffer, details, -1);
 }
 
 static void
-handle_get_capabilities_finished(GObject *source G_GNUC_UNUSED, GAsyncResult *result, gpointer user_data)
+handle_get_capabilities_finished(GObject *source, GAsyncResult *result, gpointer user_data)
 {
-  GnomeDdcWindow *self = GNOMEDDC_WINDOW(user_data);
+  g_autoptr(GnomeDdcWindow) self = user_data;
   g_autoptr(GError) error = NULL;
-  g_autoptr(GVariant) response = gnomeddc_client_call_finish(self->client, result, &error);
+  g_autoptr(GVariant) response = gnomeddc_client_call_finish(GNOMEDDC_CLIENT(source), result, &error);
+  if (self->client == NULL) {
+    return;
+  }
+
   gnomeddc_window_finish_operation(self);
 
   if (error != NULL) {
@@ -841,18 +1210,22 @@ handle_get_capabilities_finished(GObject *source G_GNUC_UNUSED, GAsyncResult *re
   const gchar *message;
   g_variant_get(response, "(&sis)", &caps_text, &status, &message);
 
-  adw_action_row_set_subtitle(self->get_capabilities_row,
-                              g_strdup_printf(_("Status %d — %s"), status, message));
+  g_autofree gchar *subtitle = g_strdup_printf(_("Status %d — %s"), status, message);
+  adw_action_row_set_subtitle(self->get_capabilities_row, subtitle);
   GtkTextBuffer *buffer = gtk_text_view_get_buffer(self->capabilities_text_view);
   gtk_text_buffer_set_text(buffer, caps_text, -1);
 }
 
 static void
-handle_get_capabilities_metadata_finished(GObject *source G_GNUC_UNUSED, GAsyncResult *result, gpointer user_data)
+handle_get_capabilities_metadata_finished(GObject *source, GAsyncResult *result, gpointer user_data)
 {
-  GnomeDdcWindow *self = GNOMEDDC_WINDOW(user_data);
+  g_autoptr(GnomeDdcWindow) self = user_data;
   g_autoptr(GError) error = NULL;
-  g_autoptr(GVariant) response = gnomeddc_client_call_finish(self->client, result, &error);
+  g_autoptr(GVariant) response = gnomeddc_client_call_finish(GNOMEDDC_CLIENT(source), result, &error);
+  if (self->client == NULL) {
+    return;
+  }
+
   gnomeddc_window_finish_operation(self);
 
   if (error != NULL) {
@@ -880,76 +1253,79 @@ handle_get_capabilities_metadata_finished(GObject *source G_GNUC_UNUSED, GAsyncR
                 &status,
                 &message);
 
-  adw_action_row_set_subtitle(self->get_capabilities_metadata_row,
-                              g_strdup_printf(_("%s — MCCS %u.%u (status %d)"),
-                                              model_name,
-                                              mccs_major,
-                                              mccs_minor,
-                                              status));
-
-  GtkTextBuffer *buffer = gtk_text_view_get_buffer(self->capabilities_text_view);
-  gtk_text_buffer_set_text(buffer, "", -1);
-
-  g_autofree gchar *header = g_strdup_printf("Model: %s\n"
-                                             "MCCS: %u.%u\n"
-                                             "Status: %d (%s)\n"
-                                             "\n"
-                                             "Commands:\n",
-                                             model_name,
-                                             mccs_major,
-                                             mccs_minor,
-                                             status,
-                                             message);
-  gtk_text_buffer_insert_at_cursor(buffer, header, -1);
+  g_autofree gchar *subtitle = g_strdup_printf(_("%s — MCCS %u.%u (status %d)"),
+                                               model_name,
+                                               mccs_major,
+                                               mccs_minor,
+                                               status);
+  adw_action_row_set_subtitle(self->get_capabilities_metadata_row, subtitle);
+
+  g_autoptr(GString) text = g_string_new(NULL);
+  g_string_append_printf(text,
+                         "Model: %s\n"
+                         "MCCS: %u.%u\n"
+                         "Status: %d (%s)\n"
+                         "\n"
+                         "Commands:\n",
+                         model_name,
+                         mccs_major,
+                         mccs_minor,
+                         status,
+                         message);
 
   GVariantIter cmd_iter;
   guint8 cmd_code;
   const gchar *cmd_desc;
   g_variant_iter_init(&cmd_iter, commands);
-  while (g_variant_iter_loop(&cmd_iter, "{ys}", &cmd_code, &cmd_desc)) {
-    g_autofree gchar *line = g_strdup_printf("  0x%02X — %s\n", cmd_code, cmd_desc);
-    gtk_text_buffer_insert_at_cursor(buffer, line, -1);
+  while (g_variant_iter_loop(&cmd_iter, "{y&s}", &cmd_code, &cmd_desc)) {
+    g_string_append(text, "  ");
+    append_vcp_code(text, cmd_code);
+    g_string_append(text, " — ");
+    g_string_append(text, cmd_desc);
+    g_string_append_c(text, '\n');
   }
 
-  gtk_text_buffer_insert_at_cursor(buffer, "\nFeatures:\n", -1);
+  g_string_append(text, "\nFeatures:\n");
   GVariantIter feature_iter;
   guint8 feature_code;
   const gchar *feature_name;
   const gchar *feature_desc;
   GVariant *permitted = NULL;
   g_variant_iter_init(&feature_iter, features);
-  while (g_variant_iter_loop(&feature_iter, "{y(ssa{ys})}",
+  while (g_variant_iter_loop(&feature_iter, "{y(&s&s@a{ys})}",
                              &feature_code,
                              &feature_name,
                              &feature_desc,
                              &permitted)) {
-    g_autofree gchar *line = g_strdup_printf("  0x%02X — %s (%s)\n",
-                                             feature_code,
-                                             feature_name,
-                                             feature_desc);
-    gtk_text_buffer_insert_at_cursor(buffer, line, -1);
+    g_string_append(text, "  ");
+    append_vcp_code(text, feature_code);
+    g_string_append_printf(text, " — %s (%s)\n", feature_name, feature_desc);
     GVariantIter value_iter;
     guint8 value_code;
     const gchar *value_name;
     g_variant_iter_init(&value_iter, permitted);
-    while (g_variant_iter_loop(&value_iter, "{ys}", &value_code, &value_name)) {
-      g_autofree gchar *value_line = g_strdup_printf("    %u — %s\n",
-                                                     value_code,
-                                                     value_name);
-      gtk_text_buffer_insert_at_cursor(buffer, value_line, -1);
+    while (g_variant_iter_loop(&value_iter, "{y&s}", &value_code, &value_name)) {
+      g_string_append_printf(text, "    %u — %s\n", value_code, value_name);
     }
   }
 
   g_variant_unref(commands);
   g_variant_unref(features);
+
+  GtkTextBuffer *buffer = gtk_text_view_get_buffer(self->capabilities_text_view);
+  gtk_text_buffer_set_text(buffer, text->str, text->len);
 }
 
 static void
-handle_restart_finished(GObject *source G_GNUC_UNUSED, GAsyncResult *result, gpointer user_data)
+handle_restart_finished(GObject *source, GAsyncResult *result, gpointer user_data)
 {
-  GnomeDdcWindow *self = GNOMEDDC_WINDOW(user_data);
+  g_autoptr(GnomeDdcWindow) self = user_data;
   g_autoptr(GError) error = NULL;
-  g_autoptr(GVariant) response = gnomeddc_client_call_finish(self->client, result, &error);
+  g_autoptr(GVariant) response = gnomeddc_client_call_finish(GNOMEDDC_CLIENT(source), result, &error);
+  if (self->client == NULL) {
+    return;
+  }
+
   gnomeddc_window_finish_operation(self);
 
   if (error != NULL) {
@@ -977,9 +1353,16 @@ static void
 search_changed_cb(GtkSearchEntry *entry, gpointer user_data)
 {
   GnomeDdcWindow *self = GNOMEDDC_WINDOW(user_data);
-  g_clear_pointer(&self->search_text, g_free);
-  self->search_text = g_strdup(gtk_editable_get_text(GTK_EDITABLE(entry)));
-  gtk_filter_changed(GTK_FILTER(self->search_filter), GTK_FILTER_CHANGE_DIFFERENT);
+  g_autofree gchar *previous = g_steal_pointer(&self->search_text);
+  self->search_text = g_utf8_casefold(gtk_editable_get_text(GTK_EDITABLE(entry)), -1);
+
+  GtkFilterChange change = GTK_FILTER_CHANGE_DIFFERENT;
+  if (previous == NULL || strstr(self->search_text, previous) != NULL) {
+    change = GTK_FILTER_CHANGE_MORE_STRICT;
+  } else if (strstr(previous, self->search_text) != NULL) {
+    change = GTK_FILTER_CHANGE_LESS_STRICT;
+  }
+  gtk_filter_changed(GTK_FILTER(self->search_filter), change);
 }
 
 static void
@@ -1026,6 +1409,9 @@ sleep_set_clicked_cb(GtkButton *button G_GNUC_UNUSED, gpointer user_data)
     return;
   }
 
+  g_hash_table_remove(self->sleep_multiplier_restore, gnomeddc_display_get_edid(display));
+  g_hash_table_add(self->sleep_multiplier_user_set, g_strdup(gnomeddc_display_get_edid(display)));
+
   gnomeddc_window_start_operation(self);
   gnomeddc_client_call_async(self->client,
                              "SetSleepMultiplier",
@@ -1036,7 +1422,7 @@ sleep_set_clicked_cb(GtkButton *button G_GNUC_UNUSED, gpointer user_data)
                                            0),
                              NULL,
                              handle_set_sleep_multiplier_finished,
-                             self);
+                             g_object_ref(self));
 }
 
 static void
@@ -1067,7 +1453,7 @@ get_vcp_clicked_cb(GtkButton *button G_GNUC_UNUSED, gpointer user_data)
                                            flags),
                              NULL,
                              handle_get_vcp_finished,
-                             self);
+                             g_object_ref(self));
 }
 
 static void
@@ -1094,14 +1480,14 @@ get_multiple_vcp_clicked_cb(GtkButton *button G_GNUC_UNUSED, gpointer user_data)
   gnomeddc_window_start_operation(self);
   gnomeddc_client_call_async(self->client,
                              "GetMultipleVcp",
-                             g_variant_new("(isayu)",
+                             g_variant_new("(is@ayu)",
                                            gnomeddc_display_get_display_number(display),
                                            gnomeddc_display_get_edid(display),
                                            codes,
                                            flags),
                              NULL,
                              handle_get_multiple_vcp_finished,
-                             self);
+                             g_object_ref(self));
 }
 
 static void
@@ -1135,7 +1521,7 @@ set_vcp_clicked_cb(GtkButton *button G_GNUC_UNUSED, gpointer user_data)
                                            flags),
                              NULL,
                              handle_set_vcp_finished,
-                             self);
+                             g_object_ref(self));
 }
 
 static void
@@ -1171,7 +1557,7 @@ set_vcp_context_clicked_cb(GtkButton *button G_GNUC_UNUSED, gpointer user_data)
                                            flags),
                              NULL,
                              handle_set_vcp_finished,
-                             self);
+                             g_object_ref(self));
 }
 
 static void
@@ -1200,13 +1586,15 @@ get_vcp_metadata_clicked_cb(GtkButton *button G_GNUC_UNUSED, gpointer user_data)
                                            flags),
                              NULL,
                              handle_get_vcp_metadata_finished,
-                             self);
+                             g_object_ref(self));
 }
 
 static void
-get_capabilities_clicked_cb(GtkButton *button G_GNUC_UNUSED, gpointer user_data)
+fetch_capabilities(GnomeDdcWindow *self,
+                   const gchar *method,
+                   GnomeDdcClientCallFlags call_flags,
+                   GAsyncReadyCallback callback)
 {
-  GnomeDdcWindow *self = GNOMEDDC_WINDOW(user_data);
   g_autoptr(GnomeDdcDisplay) display = get_selected_display(self);
   if (display == NULL) {
     show_toast(self, _("Select a display first"));
@@ -1219,42 +1607,52 @@ get_capabilities_clicked_cb(GtkButton *button G_GNUC_UNUSED, gpointer user_data)
   }
   clear_capabilities_view(self);
   gnomeddc_window_start_operation(self);
-  gnomeddc_client_call_async(self->client,
-                             "GetCapabilitiesString",
-                             g_variant_new("(isu)",
-                                           gnomeddc_display_get_display_number(display),
-                                           gnomeddc_display_get_edid(display),
-                                           flags),
-                             NULL,
-                             handle_get_capabilities_finished,
-                             self);
+  gnomeddc_client_call_full_async(self->client,
+                                  method,
+                                  g_variant_new("(isu)",
+                                                gnomeddc_display_get_display_number(display),
+                                                gnomeddc_display_get_edid(display),
+                                                flags),
+                                  call_flags,
+                                  NULL,
+                                  callback,
+                                  g_object_ref(self));
+}
+
+static void
+get_capabilities_clicked_cb(GtkButton *button G_GNUC_UNUSED, gpointer user_data)
+{
+  fetch_capabilities(GNOMEDDC_WINDOW(user_data),
+                     "GetCapabilitiesString",
+                     GNOMEDDC_CLIENT_CALL_NONE,
+                     handle_get_capabilities_finished);
+}
+
+static void
+refresh_capabilities_clicked_cb(GtkButton *button G_GNUC_UNUSED, gpointer user_data)
+{
+  fetch_capabilities(GNOMEDDC_WINDOW(user_data),
+                     "GetCapabilitiesString",
+                     GNOMEDDC_CLIENT_CALL_REFRESH,
+                     handle_get_capabilities_finished);
 }
 
 static void
 get_capabilities_metadata_clicked_cb(GtkButton *button G_GNUC_UNUSED, gpointer user_data)
 {
-  GnomeDdcWindow *self = GNOMEDDC_WINDOW(user_data);
-  g_autoptr(GnomeDdcDisplay) display = get_selected_display(self);
-  if (display == NULL) {
-    show_toast(self, _("Select a display first"));
-    return;
-  }
-  guint flags = 0;
-  if (!parse_uint_from_entry(self->vcp_flags_entry, &flags)) {
-    show_toast(self, _("Enter valid flags"));
-    return;
-  }
-  clear_capabilities_view(self);
-  gnomeddc_window_start_operation(self);
-  gnomeddc_client_call_async(self->client,
-                             "GetCapabilitiesMetadata",
-                             g_variant_new("(isu)",
-                                           gnomeddc_display_get_display_number(display),
-                                           gnomeddc_display_get_edid(display),
-                                           flags),
-                             NULL,
-                             handle_get_capabilities_metadata_finished,
-                             self);
+  fetch_capabilities(GNOMEDDC_WINDOW(user_data),
+                     "GetCapabilitiesMetadata",
+                     GNOMEDDC_CLIENT_CALL_NONE,
+                     handle_get_capabilities_metadata_finished);
+}
+
+static void
+refresh_capabilities_metadata_clicked_cb(GtkButton *button G_GNUC_UNUSED, gpointer user_data)
+{
+  fetch_capabilities(GNOMEDDC_WINDOW(user_data),
+                     "GetCapabilitiesMetadata",
+                     GNOMEDDC_CLIENT_CALL_REFRESH,
+                     handle_get_capabilities_metadata_finished);
 }
 
 static void
@@ -1271,17 +1669,13 @@ restart_clicked_cb(GtkButton *button G_GNUC_UNUSED, gpointer user_data)
                              g_variant_new("(suu)", options != NULL ? options : "", syslog_level, flags),
                              NULL,
                              handle_restart_finished,
-                             self);
+                             g_object_ref(self));
 }
 
 static void
 service_switch_toggled_cb(AdwSwitchRow *row, GParamSpec *pspec G_GNUC_UNUSED, gpointer user_data)
 {
   GnomeDdcWindow *self = GNOMEDDC_WINDOW(user_data);
-  if (self->updating_service_properties) {
-    return;
-  }
-
   const gchar *property_name = NULL;
   if (row == self->dynamic_sleep_row) {
     property_name = "DdcutilDynamicSleep";
@@ -1298,53 +1692,75 @@ service_switch_toggled_cb(AdwSwitchRow *row, GParamSpec *pspec G_GNUC_UNUSED, gp
   gnomeddc_client_set_property_async(self->client,
                                      property_name,
                                      g_variant_new_boolean(adw_switch_row_get_active(row)),
+                                     GNOMEDDC_CLIENT_CALL_NONE,
                                      NULL,
                                      NULL,
                                      NULL);
 }
 
+typedef enum {
+  SPIN_ROW_OUTPUT_LEVEL = 1 << 0,
+  SPIN_ROW_POLL_INTERVAL = 1 << 1,
+  SPIN_ROW_POLL_CASCADE = 1 << 2
+} SpinRowFlags;
+
 static void
-spin_row_value_changed_cb(GObject *object, GParamSpec *pspec G_GNUC_UNUSED, gpointer user_data)
+send_spin_row_value(GnomeDdcWindow *self,
+                    AdwSpinRow *row,
+                    const gchar *property_name,
+                    gboolean is_double,
+                    gdouble *last_sent)
 {
-  GnomeDdcWindow *self = GNOMEDDC_WINDOW(user_data);
-  if (self->updating_service_properties) {
+  gdouble value = adw_spin_row_get_value(row);
+  if (value == *last_sent) {
     return;
   }
+  *last_sent = value;
 
-  const gchar *property_name = NULL;
-  gdouble value = 0.0;
-  if (object == G_OBJECT(self->output_level_row)) {
-    property_name = "DdcutilOutputLevel";
-    value = adw_spin_row_get_value(self->output_level_row);
-    gnomeddc_client_set_property_async(self->client,
-                                       property_name,
-                                       g_variant_new_uint32((guint32) value),
-                                       NULL,
-                                       NULL,
-                                       NULL);
-    return;
+  gnomeddc_client_set_property_async(self->client,
+                                     property_name,
+                                     is_double ? g_variant_new_double(value)
+                                               : g_variant_new_uint32((guint32) value),
+                                     GNOMEDDC_CLIENT_CALL_SUPERSEDE,
+                                     NULL,
+                                     NULL,
+                                     NULL);
+}
+
+static gboolean
+flush_spin_row_writes(gpointer user_data)
+{
+  GnomeDdcWindow *self = GNOMEDDC_WINDOW(user_data);
+  guint changed = self->spin_rows_changed;
+  self->spin_write_source_id = 0;
+  self->spin_rows_changed = 0;
+
+  if (changed & SPIN_ROW_OUTPUT_LEVEL) {
+    send_spin_row_value(self, self->output_level_row, "DdcutilOutputLevel", FALSE, &self->output_level_sent);
   }
-  if (object == G_OBJECT(self->poll_interval_row)) {
-    property_name = "ServicePollInterval";
-    value = adw_spin_row_get_value(self->poll_interval_row);
-    gnomeddc_client_set_property_async(self->client,
-                                       property_name,
-                                       g_variant_new_uint32((guint32) value),
-                                       NULL,
-                                       NULL,
-                                       NULL);
-    return;
+  if (changed & SPIN_ROW_POLL_INTERVAL) {
+    send_spin_row_value(self, self->poll_interval_row, "ServicePollInterval", FALSE, &self->poll_interval_sent);
   }
-  if (object == G_OBJECT(self->poll_cascade_row)) {
-    property_name = "ServicePollCascadeInterval";
-    value = adw_spin_row_get_value(self->poll_cascade_row);
-    gnomeddc_client_set_property_async(self->client,
-                                       property_name,
-                                       g_variant_new_double(value),
-                                       NULL,
-                                       NULL,
-                                       NULL);
+  if (changed & SPIN_ROW_POLL_CASCADE) {
+    send_spin_row_value(self, self->poll_cascade_row, "ServicePollCascadeInterval", TRUE, &self->poll_cascade_sent);
   }
+
+  return G_SOURCE_REMOVE;
+}
+
+static void
+spin_row_value_changed_cb(GObject *object, GParamSpec *pspec G_GNUC_UNUSED, gpointer user_data)
+{
+  GnomeDdcWindow *self = GNOMEDDC_WINDOW(user_data);
+  if (object == G_OBJECT(self->output_level_row)) {
+    self->spin_rows_changed |= SPIN_ROW_OUTPUT_LEVEL;
+  } else if (object == G_OBJECT(self->poll_interval_row)) {
+    self->spin_rows_changed |= SPIN_ROW_POLL_INTERVAL;
+  } else if (object == G_OBJECT(self->poll_cascade_row)) {
+    self->spin_rows_changed |= SPIN_ROW_POLL_CASCADE;
+  }
+  g_clear_handle_id(&self->spin_write_source_id, g_source_remove);
+  self->spin_write_source_id = g_timeout_add(SPIN_ROW_WRITE_DELAY_MS, flush_spin_row_writes, self);
 }
 
 
@@ -1353,14 +1769,22 @@ gnomeddc_window_update_selection(GnomeDdcWindow *self)
 {
   g_autoptr(GnomeDdcDisplay) display = get_selected_display(self);
   update_overview_rows(self, display);
-  if (display == NULL) {
-    clear_capabilities_view(self);
-    adw_action_row_set_subtitle(self->get_vcp_row, "");
-    adw_action_row_set_subtitle(self->get_multiple_vcp_row, "");
-    adw_action_row_set_subtitle(self->get_vcp_metadata_row, "");
-    adw_action_row_set_subtitle(self->get_capabilities_row, "");
-    adw_action_row_set_subtitle(self->get_capabilities_metadata_row, "");
-    return;
+  clear_capabilities_view(self);
+  adw_action_row_set_subtitle(self->get_vcp_row, "");
+  adw_action_row_set_subtitle(self->get_multiple_vcp_row, "");
+  adw_action_row_set_subtitle(self->get_vcp_metadata_row, "");
+  adw_action_row_set_subtitle(self->get_capabilities_row, "");
+  adw_action_row_set_subtitle(self->get_capabilities_metadata_row, "");
+}
+
+static void
+visible_page_changed_cb(GObject *object G_GNUC_UNUSED, GParamSpec *pspec G_GNUC_UNUSED, gpointer user_data)
+{
+  GnomeDdcWindow *self = GNOMEDDC_WINDOW(user_data);
+  GtkWidget *page = adw_view_stack_get_visible_child(ADW_VIEW_STACK(self->view_stack));
+
+  if (page == self->service_page && !self->service_properties_loaded) {
+    gnomeddc_window_refresh_service_properties(self);
   }
 }
 
@@ -1370,6 +1794,7 @@ display_list_setup(GtkSignalListItemFactory *factory G_GNUC_UNUSED, GtkListItem
 {
   AdwActionRow *row = g_object_new(ADW_TYPE_ACTION_ROW,
                                    "activatable", FALSE,
+                                   "use-markup", FALSE,
                                    NULL);
   gtk_list_item_set_child(list_item, GTK_WIDGET(row));
 }
@@ -1379,25 +1804,186 @@ display_list_bind(GtkSignalListItemFactory *factory G_GNUC_UNUSED, GtkListItem *
 {
   GnomeDdcDisplay *display = GNOMEDDC_DISPLAY(gtk_list_item_get_item(list_item));
   AdwActionRow *row = ADW_ACTION_ROW(gtk_list_item_get_child(list_item));
-  g_autofree gchar *full_name = gnomeddc_display_dup_full_name(display);
-  g_autofree gchar *subtitle = g_strdup_printf(_("Display %d — %s"),
-                                               gnomeddc_display_get_display_number(display),
-                                               gnomeddc_display_get_serial(display));
-  adw_preferences_row_set_title(ADW_PREFERENCES_ROW(row), full_name);
-  adw_action_row_set_subtitle(row, subtitle);
+  adw_preferences_row_set_title(ADW_PREFERENCES_ROW(row), gnomeddc_display_get_full_name(display));
+  adw_action_row_set_subtitle(row, gnomeddc_display_get_subtitle(display));
+}
+
+
+static void
+gnomeddc_window_set_property(GObject *object, guint prop_id, const GValue *value, GParamSpec *pspec)
+{
+  GnomeDdcWindow *self = GNOMEDDC_WINDOW(object);
+
+  switch (prop_id) {
+  case PROP_CLIENT:
+    self->client = g_value_dup_object(value);
+    break;
+  default:
+    G_OBJECT_WARN_INVALID_PROPERTY_ID(object, prop_id, pspec);
+  }
+}
+
+static gboolean
+refresh_changed_displays(gpointer user_data)
+{
+  GnomeDdcWindow *self = GNOMEDDC_WINDOW(user_data);
+  self->displays_changed_source_id = 0;
+  gnomeddc_window_refresh_displays(self, FALSE);
+  return G_SOURCE_REMOVE;
 }
 
+static void
+connected_displays_changed_cb(GnomeDdcClient *client G_GNUC_UNUSED,
+                              const gchar *edid G_GNUC_UNUSED,
+                              gint event_type,
+                              guint flags G_GNUC_UNUSED,
+                              gpointer user_data)
+{
+  GnomeDdcWindow *self = GNOMEDDC_WINDOW(user_data);
+  if (event_type == DDCA_EVENT_DPMS_AWAKE || event_type == DDCA_EVENT_DPMS_ASLEEP ||
+      self->displays_changed_source_id != 0) {
+    return;
+  }
+
+  self->displays_changed_source_id = g_timeout_add_seconds(DISPLAYS_CHANGED_DELAY_S, refresh_changed_displays, self);
+}
+
+static void
+vcp_toast_dismissed_cb(AdwToast *toast G_GNUC_UNUSED, gpointer user_data)
+{
+  GnomeDdcWindow *self = GNOMEDDC_WINDOW(user_data);
+  g_clear_object(&self->vcp_toast);
+  g_clear_pointer(&self->vcp_toast_source, g_free);
+  self->vcp_toast_changes = 0;
+}
+
+static void
+vcp_value_changed_cb(GnomeDdcClient *client,
+                     gint display_number,
+                     const gchar *edid,
+                     guint8 code,
+                     guint value,
+                     const gchar *source_client,
+                     const gchar *source_context G_GNUC_UNUSED,
+                     guint flags G_GNUC_UNUSED,
+                     gpointer user_data)
+{
+  GnomeDdcWindow *self = GNOMEDDC_WINDOW(user_data);
+  GDBusProxy *proxy = gnomeddc_client_get_proxy(client);
+  if (proxy != NULL &&
+      g_strcmp0(source_client, g_dbus_connection_get_unique_name(g_dbus_proxy_get_connection(proxy))) == 0) {
+    return;
+  }
+
+  if (!g_hash_table_contains(self->known_edids, edid)) {
+    return;
+  }
+
+  g_string_printf(self->vcp_toast_key, "%s:%u", edid, code);
+  gint64 now = g_get_monotonic_time();
+  gint64 *last_shown = g_hash_table_lookup(self->vcp_toast_times, self->vcp_toast_key->str);
+  if (last_shown != NULL && now - *last_shown < VCP_CHANGE_TOAST_INTERVAL) {
+    return;
+  }
+
+  if (last_shown == NULL) {
+    last_shown = g_new(gint64, 1);
+    g_hash_table_insert(self->vcp_toast_times, g_strdup(self->vcp_toast_key->str), last_shown);
+  }
+  *last_shown = now;
+
+  if (self->vcp_toast != NULL) {
+    self->vcp_toast_changes++;
+    if (g_strcmp0(self->vcp_toast_source, source_client) != 0) {
+      g_clear_pointer(&self->vcp_toast_source, g_free);
+    }
+
+    g_autofree gchar *title = NULL;
+    if (self->vcp_toast_source != NULL) {
+      title = g_strdup_printf(ngettext("%u VCP value changed by %s",
+                                       "%u VCP values changed by %s",
+                                       self->vcp_toast_changes),
+                              self->vcp_toast_changes, self->vcp_toast_source);
+    } else {
+      title = g_strdup_printf(ngettext("%u VCP value changed",
+                                       "%u VCP values changed",
+                                       self->vcp_toast_changes),
+                              self->vcp_toast_changes);
+    }
+    adw_toast_set_title(self->vcp_toast, title);
+    return;
+  }
+
+  g_autofree gchar *title = g_strdup_printf(_("Display %d: VCP 0x%02X set to %u by %s"), display_number, code, value, source_client);
+  self->vcp_toast = adw_toast_new(title);
+  self->vcp_toast_source = g_strdup(source_client);
+  self->vcp_toast_changes = 1;
+  g_signal_connect_object(self->vcp_toast, "dismissed", G_CALLBACK(vcp_toast_dismissed_cb), self, 0);
+  adw_toast_overlay_add_toast(self->toast_overlay, g_object_ref(self->vcp_toast));
+}
+
+static void
+gnomeddc_window_constructed(GObject *object)
+{
+  G_OBJECT_CLASS(gnomeddc_window_parent_class)->constructed(object);
+
+  GnomeDdcWindow *self = GNOMEDDC_WINDOW(object);
+  if (self->client == NULL) {
+    self->client = gnomeddc_client_new();
+  }
+
+  g_signal_connect_object(self->client,
+                          "connected-displays-changed",
+                          G_CALLBACK(connected_displays_changed_cb),
+                          self,
+                          0);
+  g_signal_connect_object(self->client,
+                          "vcp-value-changed",
+                          G_CALLBACK(vcp_value_changed_cb),
+                          self,
+                          0);
+
+  if (!gnomeddc_client_is_connected(self->client)) {
+    const gchar *error = gnomeddc_client_get_last_error(self->client);
+    show_toast(self, "%s", error != NULL ? error : _("Unable to reach ddcutil-service"));
+  } else {
+    load_cached_displays(self);
+    gnomeddc_window_refresh_displays(self, FALSE);
+  }
+}
 
 static void
 gnomeddc_window_dispose(GObject *object)
 {
   GnomeDdcWindow *self = GNOMEDDC_WINDOW(object);
+  if (self->spin_write_source_id != 0) {
+    g_source_remove(self->spin_write_source_id);
+    flush_spin_row_writes(self);
+  }
+  g_clear_handle_id(&self->displays_changed_source_id, g_source_remove);
+  g_cancellable_cancel(self->sleep_multiplier_cancellable);
+  if (self->client != NULL && self->sleep_multiplier_restore != NULL) {
+    restore_sleep_multipliers(self);
+  }
+  g_clear_pointer(&self->sleep_multiplier_restore, g_hash_table_unref);
+  g_clear_pointer(&self->sleep_multiplier_user_set, g_hash_table_unref);
+  g_clear_pointer(&self->sleep_multiplier_excluded, g_strfreev);
+  g_clear_object(&self->sleep_multiplier_cancellable);
   g_clear_object(&self->client);
   g_clear_object(&self->display_store);
   g_clear_object(&self->filter_model);
   g_clear_object(&self->search_filter);
   g_clear_object(&self->selection);
   g_clear_pointer(&self->search_text, g_free);
+  g_clear_pointer(&self->service_properties, g_hash_table_unref);
+  g_clear_pointer(&self->display_array, g_variant_unref);
+  g_clear_pointer(&self->known_edids, g_hash_table_unref);
+  g_clear_pointer(&self->vcp_toast_times, g_hash_table_unref);
+  if (self->vcp_toast_key != NULL) {
+    g_string_free(g_steal_pointer(&self->vcp_toast_key), TRUE);
+  }
+  g_clear_object(&self->vcp_toast);
+  g_clear_pointer(&self->vcp_toast_source, g_free);
   G_OBJECT_CLASS(gnomeddc_window_parent_class)->dispose(object);
 }
 
@@ -1406,8 +1992,22 @@ gnomeddc_window_class_init(GnomeDdcWindowClass *klass)
 {
   GtkWidgetClass *widget_class = GTK_WIDGET_CLASS(klass);
   GObjectClass *object_class = G_OBJECT_CLASS(klass);
+  object_class->set_property = gnomeddc_window_set_property;
+  object_class->constructed = gnomeddc_window_constructed;
   object_class->dispose = gnomeddc_window_dispose;
 
+  service_property_index = g_hash_table_new(g_str_hash, g_str_equal);
+  for (guint i = 0; i < G_N_ELEMENTS(service_property_rows); i++) {
+    g_hash_table_insert(service_property_index,
+                        (gpointer) service_property_rows[i].key,
+                        (gpointer) &service_property_rows[i]);
+  }
+
+  properties[PROP_CLIENT] = g_param_spec_object("client", NULL, NULL,
+                                                GNOMEDDC_TYPE_CLIENT,
+                                                G_PARAM_WRITABLE | G_PARAM_CONSTRUCT_ONLY | G_PARAM_STATIC_STRINGS);
+  g_object_class_install_properties(object_class, N_PROPS, properties);
+
   gtk_widget_class_set_template_from_resource(widget_class,
                                               "/com/ddcutil/GnomeDDC/ui/gnomeddc-window.ui");
 
@@ -1473,6 +2073,27 @@ gnomeddc_window_class_init(GnomeDdcWindowClass *klass)
   gtk_widget_class_bind_template_child(widget_class, GnomeDdcWindow, restart_flags_row);
   gtk_widget_class_bind_template_child(widget_class, GnomeDdcWindow, capabilities_text_view);
   gtk_widget_class_bind_template_child(widget_class, GnomeDdcWindow, view_stack);
+  gtk_widget_class_bind_template_child(widget_class, GnomeDdcWindow, service_page);
+
+  gtk_widget_class_bind_template_callback(widget_class, visible_page_changed_cb);
+  gtk_widget_class_bind_template_callback(widget_class, search_changed_cb);
+  gtk_widget_class_bind_template_callback(widget_class, refresh_clicked_cb);
+  gtk_widget_class_bind_template_callback(widget_class, list_clicked_cb);
+  gtk_widget_class_bind_template_callback(widget_class, state_clicked_cb);
+  gtk_widget_class_bind_template_callback(widget_class, sleep_refresh_clicked_cb);
+  gtk_widget_class_bind_template_callback(widget_class, sleep_set_clicked_cb);
+  gtk_widget_class_bind_template_callback(widget_class, get_vcp_clicked_cb);
+  gtk_widget_class_bind_template_callback(widget_class, get_multiple_vcp_clicked_cb);
+  gtk_widget_class_bind_template_callback(widget_class, set_vcp_clicked_cb);
+  gtk_widget_class_bind_template_callback(widget_class, set_vcp_context_clicked_cb);
+  gtk_widget_class_bind_template_callback(widget_class, get_vcp_metadata_clicked_cb);
+  gtk_widget_class_bind_template_callback(widget_class, get_capabilities_clicked_cb);
+  gtk_widget_class_bind_template_callback(widget_class, refresh_capabilities_clicked_cb);
+  gtk_widget_class_bind_template_callback(widget_class, get_capabilities_metadata_clicked_cb);
+  gtk_widget_class_bind_template_callback(widget_class, refresh_capabilities_metadata_clicked_cb);
+  gtk_widget_class_bind_template_callback(widget_class, restart_clicked_cb);
+  gtk_widget_class_bind_template_callback(widget_class, service_switch_toggled_cb);
+  gtk_widget_class_bind_template_callback(widget_class, spin_row_value_changed_cb);
 }
 
 static void
@@ -1480,7 +2101,18 @@ gnomeddc_window_init(GnomeDdcWindow *self)
 {
   gtk_widget_init_template(GTK_WIDGET(self));
 
-  self->client = gnomeddc_client_new();
+  self->output_level_sent = NAN;
+  self->poll_interval_sent = NAN;
+  self->poll_cascade_sent = NAN;
+
+  self->service_properties = g_hash_table_new_full(g_direct_hash, g_direct_equal, NULL, (GDestroyNotify) g_variant_unref);
+  self->known_edids = g_hash_table_new(g_str_hash, g_str_equal);
+  self->sleep_multiplier_restore = g_hash_table_new_full(g_str_hash, g_str_equal, g_free, (GDestroyNotify) g_variant_unref);
+  self->sleep_multiplier_user_set = g_hash_table_new_full(g_str_hash, g_str_equal, g_free, NULL);
+  self->sleep_multiplier_cancellable = g_cancellable_new();
+  load_sleep_multiplier_override(self);
+  self->vcp_toast_times = g_hash_table_new_full(g_str_hash, g_str_equal, g_free, g_free);
+  self->vcp_toast_key = g_string_new(NULL);
   self->display_store = g_list_store_new(GNOMEDDC_TYPE_DISPLAY);
   self->search_filter = gtk_custom_filter_new(display_filter_func, self, NULL);
   self->filter_model = gtk_filter_list_model_new(G_LIST_MODEL(self->display_store), GTK_FILTER(self->search_filter));
@@ -1495,38 +2127,6 @@ gnomeddc_window_init(GnomeDdcWindow *self)
   gtk_list_view_set_model(self->display_list, GTK_SELECTION_MODEL(self->selection));
 
   g_signal_connect(self->selection, "selection-changed", G_CALLBACK(selection_changed_cb), self);
-  g_signal_connect(self->display_search_entry, "search-changed", G_CALLBACK(search_changed_cb), self);
-  g_signal_connect(self->refresh_button, "clicked", G_CALLBACK(refresh_clicked_cb), self);
-  g_signal_connect(self->list_detected_button, "clicked", G_CALLBACK(list_clicked_cb), self);
-  g_signal_connect(self->detect_button, "clicked", G_CALLBACK(refresh_clicked_cb), self);
-  g_signal_connect(self->query_state_button, "clicked", G_CALLBACK(state_clicked_cb), self);
-  g_signal_connect(self->sleep_multiplier_refresh_button, "clicked", G_CALLBACK(sleep_refresh_clicked_cb), self);
-  g_signal_connect(self->set_sleep_multiplier_button, "clicked", G_CALLBACK(sleep_set_clicked_cb), self);
-  g_signal_connect(self->get_vcp_button, "clicked", G_CALLBACK(get_vcp_clicked_cb), self);
-  g_signal_connect(self->get_multiple_vcp_button, "clicked", G_CALLBACK(get_multiple_vcp_clicked_cb), self);
-  g_signal_connect(self->set_vcp_button, "clicked", G_CALLBACK(set_vcp_clicked_cb), self);
-  g_signal_connect(self->set_vcp_context_button, "clicked", G_CALLBACK(set_vcp_context_clicked_cb), self);
-  g_signal_connect(self->get_vcp_metadata_button, "clicked", G_CALLBACK(get_vcp_metadata_clicked_cb), self);
-  g_signal_connect(self->get_capabilities_button, "clicked", G_CALLBACK(get_capabilities_clicked_cb), self);
-  g_signal_connect(self->get_capabilities_metadata_button, "clicked", G_CALLBACK(get_capabilities_metadata_clicked_cb), self);
-  g_signal_connect(self->restart_button, "clicked", G_CALLBACK(restart_clicked_cb), self);
-
-  g_signal_connect(self->dynamic_sleep_row, "notify::active", G_CALLBACK(service_switch_toggled_cb), self);
-  g_signal_connect(self->info_logging_row, "notify::active", G_CALLBACK(service_switch_toggled_cb), self);
-  g_signal_connect(self->connectivity_signals_row, "notify::active", G_CALLBACK(service_switch_toggled_cb), self);
-
-  g_signal_connect(self->output_level_row, "notify::value", G_CALLBACK(spin_row_value_changed_cb), self);
-  g_signal_connect(self->poll_interval_row, "notify::value", G_CALLBACK(spin_row_value_changed_cb), self);
-  g_signal_connect(self->poll_cascade_row, "notify::value", G_CALLBACK(spin_row_value_changed_cb), self);
 
   update_empty_state(self);
-
-  if (!gnomeddc_client_is_connected(self->client)) {
-    const gchar *error = gnomeddc_client_get_last_error(self->client);
-    show_toast(self, "%s", error != NULL ? error : _("Unable to reach ddcutil-service"));
-  } else {
-    gnomeddc_window_refresh_displays(self, FALSE);
-    gnomeddc_window_refresh_service_properties(self);
-  }
 }
-